@@ -9,14 +9,14 @@ CREATE TABLE files (
     filename VARCHAR(500) NOT NULL,
     file_size BIGINT NOT NULL,
     mime_type VARCHAR(100),
-    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
-    uploaded_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    uploaded_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     
     -- Retention management
     standard_retention_days INTEGER NOT NULL DEFAULT 90,
-    extended_retention_due_date TIMESTAMP,
+    extended_retention_due_date TIMESTAMPTZ,
     retention_reason TEXT,
-    retention_updated_at TIMESTAMP,
+    retention_updated_at TIMESTAMPTZ,
     retention_updated_by VARCHAR(255),
     
     -- Status tracking
@@ -42,22 +42,33 @@ ADD CONSTRAINT files_status_check CHECK (status IN ('active', 'extended', 'expir
 CREATE TABLE retention_history (
     id SERIAL PRIMARY KEY,
     file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
-    previous_due_date TIMESTAMP,
-    new_due_date TIMESTAMP NOT NULL,
+    previous_due_date TIMESTAMPTZ,
+    new_due_date TIMESTAMPTZ NOT NULL,
     reason TEXT NOT NULL,
     updated_by VARCHAR(255) NOT NULL,
-    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
+-- Archive watermark - files with created_at <= archived_until count as archived.
+-- Advancing it is a single-row UPDATE; the files table is never rewritten.
+CREATE TABLE des_archive_config (
+    id INTEGER PRIMARY KEY,
+    archived_until TIMESTAMPTZ NOT NULL,
+    lag_days INTEGER NOT NULL DEFAULT 7
+);
+
+INSERT INTO des_archive_config (id, archived_until, lag_days)
+VALUES (1, date_trunc('day', NOW(), 'UTC') - INTERVAL '30 days', 7);
+
 -- Cases table - simulates legal/business cases
 CREATE TABLE cases (
     id SERIAL PRIMARY KEY,
     case_number VARCHAR(100) UNIQUE NOT NULL,
     case_name VARCHAR(500) NOT NULL,
     status VARCHAR(50) NOT NULL DEFAULT 'open',  -- open, closed, extended
-    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
-    closed_at TIMESTAMP,
-    retention_due_date TIMESTAMP,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    closed_at TIMESTAMPTZ,
+    retention_due_date TIMESTAMPTZ,
     department VARCHAR(100)
 );
 
@@ -65,17 +76,20 @@ CREATE TABLE cases (
 CREATE TABLE case_files (
     case_id INTEGER NOT NULL REFERENCES cases(id) ON DELETE CASCADE,
     file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
-    added_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    added_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     PRIMARY KEY (case_id, file_id)
 );
 
 -- Indexes for performance
 CREATE INDEX idx_files_uid ON files(uid);
 CREATE INDEX idx_files_created_at ON files(created_at);
-CREATE INDEX idx_files_status ON files(status);
-CREATE INDEX idx_files_case_number ON files(case_number);
+CREATE INDEX idx_files_uploaded_at ON files(uploaded_at);
+-- Back the list_files filters + ORDER BY uploaded_at DESC (backward index scan, no sort)
+CREATE INDEX ix_files_status_uploaded ON files(status, uploaded_at);
+CREATE INDEX ix_files_case_uploaded ON files(case_number, uploaded_at);
 CREATE INDEX idx_files_extended_retention ON files(in_extended_retention);
-CREATE INDEX idx_retention_history_file_id ON retention_history(file_id);
+-- Serves get_retention_history: WHERE file_id = ? ORDER BY updated_at DESC
+CREATE INDEX ix_rh_file_updated ON retention_history(file_id, updated_at);
 CREATE INDEX idx_cases_case_number ON cases(case_number);
 
 -- Insert sample cases
@@ -6,14 +6,15 @@ Obsługuje upload plików, listowanie, i zarządzanie retencją przez DES API
 import logging
 import os
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 import httpx
-from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import Depends, FastAPI, File, Form, HTTPException, Query, Request, UploadFile
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from fastapi.templating import Jinja2Templates
-from sqlalchemy import BigInteger, Boolean, Column, DateTime, Integer, String, Text, create_engine
+from jinja2 import TemplateNotFound
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text, create_engine, func, or_, select, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, sessionmaker
 
@@ -34,26 +35,37 @@ logger = logging.getLogger(__name__)
 logger.info("Idempotency window set to %d seconds", IDEMPOTENCY_WINDOW)
 
 # Database setup
-engine = create_engine(DATABASE_URL)
+engine = create_engine(
+    DATABASE_URL,
+    pool_size=20,
+    max_overflow=20,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    pool_timeout=30,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 # Models
 class FileRecord(Base):
     __tablename__ = "files"
+    __table_args__ = (
+        Index("ix_files_status_uploaded", "status", "uploaded_at"),
+        Index("ix_files_case_uploaded", "case_number", "uploaded_at"),
+    )
     
     id = Column(Integer, primary_key=True)
     uid = Column(String(255), unique=True, nullable=False)
     filename = Column(String(500), nullable=False)
     file_size = Column(BigInteger, nullable=False)
     mime_type = Column(String(100))
-    created_at = Column(DateTime, nullable=False, default=datetime.now)
-    uploaded_at = Column(DateTime, nullable=False, default=datetime.now)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    uploaded_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
     
     standard_retention_days = Column(Integer, nullable=False, default=90)
-    extended_retention_due_date = Column(DateTime)
+    extended_retention_due_date = Column(DateTime(timezone=True))
     retention_reason = Column(Text)
-    retention_updated_at = Column(DateTime)
+    retention_updated_at = Column(DateTime(timezone=True))
     retention_updated_by = Column(String(255))
     
     status = Column(String(50), nullable=False, default='active')
@@ -66,18 +78,115 @@ class FileRecord(Base):
 
 class RetentionHistoryRecord(Base):
     __tablename__ = "retention_history"
+    __table_args__ = (Index("ix_rh_file_updated", "file_id", "updated_at"),)
     
     id = Column(Integer, primary_key=True)
-    file_id = Column(Integer, nullable=False)
-    previous_due_date = Column(DateTime)
-    new_due_date = Column(DateTime, nullable=False)
+    file_id = Column(Integer, ForeignKey("files.id", ondelete="CASCADE"), nullable=False)
+    previous_due_date = Column(DateTime(timezone=True))
+    new_due_date = Column(DateTime(timezone=True), nullable=False)
     reason = Column(Text, nullable=False)
     updated_by = Column(String(255), nullable=False)
-    updated_at = Column(DateTime, nullable=False, default=datetime.now)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+class ArchiveConfigRecord(Base):
+    """Singleton watermark row: files with created_at <= archived_until are archived."""
+    __tablename__ = "des_archive_config"
+    
+    id = Column(Integer, primary_key=True)
+    archived_until = Column(DateTime(timezone=True), nullable=False)
+    lag_days = Column(Integer, nullable=False, default=7)
+
+# Server-side JSON for list_files: avoids ORM hydration and a per-row Python loop.
+# "archived" is derived from the watermark instead of being stored per row.
+# Pages are keyset-paginated on (uploaded_at, id) so each request reads at most :limit rows.
+LIST_FILES_SQL = """
+SELECT json_build_object(
+    'files', COALESCE(
+        json_agg(
+            json_build_object(
+                'id', f.id,
+                'uid', f.uid,
+                'filename', f.filename,
+                'file_size', f.file_size,
+                'created_at', f.created_at,
+                'status', f.status,
+                'case_number', f.case_number,
+                'department', f.department,
+                'in_extended_retention', f.in_extended_retention,
+                'extended_retention_due_date', f.extended_retention_due_date,
+                'retention_reason', f.retention_reason,
+                'days_until_expiration', GREATEST(0, EXTRACT(DAY FROM
+                    COALESCE(f.extended_retention_due_date, f.created_at + make_interval(days => f.standard_retention_days))
+                    - now()
+                ))::int,
+                'archived', COALESCE(f.created_at <= cfg.archived_until, FALSE)
+            )
+            ORDER BY f.uploaded_at DESC, f.id DESC
+        ),
+        '[]'
+    ),
+    'next_cursor', CASE WHEN count(f.id) = :limit THEN json_build_object(
+        'after_uploaded_at', min(f.uploaded_at) FILTER (WHERE f.is_last),
+        'after_id', min(f.id) FILTER (WHERE f.is_last)
+    ) END
+)::text
+FROM (
+    SELECT page.*, row_number() OVER (ORDER BY uploaded_at, id) = 1 AS is_last
+    FROM (
+        SELECT *
+        FROM files
+        {where}
+        ORDER BY uploaded_at DESC, id DESC
+        LIMIT :limit
+    ) page
+) f
+LEFT JOIN des_archive_config cfg ON cfg.id = 1
+"""
+
+# Watermark sweep: one single-row UPDATE instead of touching every archived file
+ADVANCE_WATERMARK_SQL = """
+UPDATE des_archive_config
+SET archived_until = date_trunc('day', now() - make_interval(days => lag_days), 'UTC')
+WHERE id = 1
+  AND archived_until < date_trunc('day', now() - make_interval(days => lag_days), 'UTC')
+RETURNING archived_until, lag_days
+"""
 
 # FastAPI app
-app = FastAPI(title="Business System Mock", version="1.0.0")
+app = FastAPI(title="Business System Mock", version="1.0.0", default_response_class=ORJSONResponse)
 templates = Jinja2Templates(directory="/app/templates")
+# Templates are baked into the image; skip the per-render os.stat freshness check
+templates.env.auto_reload = False
+
+@app.on_event("startup")
+async def precompile_templates():
+    try:
+        templates.env.get_template("index.html")
+    except TemplateNotFound:
+        logger.warning("Template index.html not found; dashboard will be unavailable")
+
+# Shared DES API client (keep-alive pool, created per worker at startup)
+des_client: Optional[httpx.AsyncClient] = None
+
+@app.on_event("startup")
+async def reset_db_pool():
+    # Each worker starts with an empty pool; connections inherited across fork() are
+    # dropped (not closed, which would also close them for the parent) so sockets are never shared.
+    engine.dispose(close=False)
+
+@app.on_event("startup")
+async def open_des_client():
+    global des_client
+    des_client = httpx.AsyncClient(
+        base_url=DES_API_URL,
+        timeout=30.0,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0),
+    )
+
+@app.on_event("shutdown")
+async def close_des_client():
+    if des_client is not None:
+        await des_client.aclose()
 
 # Dependency
 def get_db():
@@ -97,39 +206,32 @@ async def home(request: Request):
         "s3_endpoint": S3_ENDPOINT
     })
 
-@app.get("/api/files", response_class=JSONResponse)
+@app.get("/api/files", response_class=ORJSONResponse)
 async def list_files(
     status: Optional[str] = None,
     case_number: Optional[str] = None,
-    db: Session = next(get_db())
+    after_uploaded_at: Optional[datetime] = None,
+    after_id: Optional[int] = None,
+    limit: int = Query(200, ge=1, le=1000),
+    db: Session = Depends(get_db)
 ):
-    """List all files with filters"""
-    query = db.query(FileRecord)
-    
+    """List files with filters, newest first, one keyset page at a time"""
+    conditions = []
+    params = {"limit": limit}
     if status:
-        query = query.filter(FileRecord.status == status)
+        conditions.append("status = :status")
+        params["status"] = status
     if case_number:
-        query = query.filter(FileRecord.case_number == case_number)
-    
-    files = query.order_by(FileRecord.uploaded_at.desc()).all()
-    
-    return [
-        {
-            "id": f.id,
-            "uid": f.uid,
-            "filename": f.filename,
-            "file_size": f.file_size,
-            "created_at": f.created_at.isoformat() if f.created_at else None,
-            "status": f.status,
-            "case_number": f.case_number,
-            "department": f.department,
-            "in_extended_retention": f.in_extended_retention,
-            "extended_retention_due_date": f.extended_retention_due_date.isoformat() if f.extended_retention_due_date else None,
-            "retention_reason": f.retention_reason,
-            "days_until_expiration": calculate_days_until_expiration(f)
-        }
-        for f in files
-    ]
+        conditions.append("case_number = :case_number")
+        params["case_number"] = case_number
+    if after_uploaded_at is not None and after_id is not None:
+        conditions.append("(uploaded_at, id) < (:after_uploaded_at, :after_id)")
+        params["after_uploaded_at"] = after_uploaded_at
+        params["after_id"] = after_id
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    payload = db.execute(text(LIST_FILES_SQL.format(where=where)), params).scalar_one()
+    return Response(content=payload, media_type="application/json")
 
 @app.post("/api/files/upload")
 async def upload_file(
@@ -137,16 +239,17 @@ async def upload_file(
     case_number: Optional[str] = Form(None),
     department: Optional[str] = Form("General"),
     document_type: Optional[str] = Form("Document"),
-    db: Session = next(get_db())
+    db: Session = Depends(get_db)
 ):
     """Upload file to system (simulates business system upload)"""
     try:
         # Generate UID
         file_uid = f"file-{uuid.uuid4()}"
         
-        # Read file content
-        content = await file.read()
-        file_size = len(content)
+        # Measure file size in 64 KiB chunks instead of buffering the whole body
+        file_size = 0
+        while chunk := await file.read(1 << 16):
+            file_size += len(chunk)
         
         # Store in database
         file_record = FileRecord(
@@ -185,41 +288,62 @@ async def extend_retention(
     retention_days: int = Form(...),
     reason: str = Form(...),
     updated_by: str = Form("system_admin"),
-    db: Session = next(get_db())
+    db: Session = Depends(get_db)
 ):
     """Extend retention for a file - calls DES API"""
-    # Get file record
+    now = datetime.now(timezone.utc)
+    
     file_record = db.query(FileRecord).filter(FileRecord.id == file_id).first()
     if not file_record:
         raise HTTPException(status_code=404, detail="File not found")
-    
-    now = datetime.now()
-    if file_record.retention_updated_at:
-        seconds_since_update = (now - file_record.retention_updated_at).total_seconds()
-        if seconds_since_update < IDEMPOTENCY_WINDOW:
-            logger.warning("Retention update requested too soon after previous update for file_id=%s", file_id)
-            idempotency_rejections_total.inc()
-            raise HTTPException(status_code=429, detail="Retention was just updated, please wait")
-    
+    previous_updated_at = file_record.retention_updated_at
+
+    # Claim the idempotency window with one conditional UPDATE and commit it straight away, so no row
+    # lock or transaction is held across the DES call; a concurrent request simply updates zero rows.
+    claimed = (
+        db.query(FileRecord)
+        .filter(
+            FileRecord.id == file_id,
+            or_(
+                FileRecord.retention_updated_at.is_(None),
+                FileRecord.retention_updated_at < now - timedelta(seconds=IDEMPOTENCY_WINDOW),
+            ),
+        )
+        .update({FileRecord.retention_updated_at: now}, synchronize_session=False)
+    )
+    db.commit()
+    if claimed == 0:
+        logger.warning("Retention update requested too soon after previous update for file_id=%s", file_id)
+        idempotency_rejections_total.inc()
+        raise HTTPException(status_code=429, detail="Retention was just updated, please wait")
+    db.refresh(file_record)
+
+    def release_claim() -> None:
+        # Give the window back if DES did not apply the change, unless a later request already took it.
+        db.query(FileRecord).filter(
+            FileRecord.id == file_id, FileRecord.retention_updated_at == now
+        ).update({FileRecord.retention_updated_at: previous_updated_at}, synchronize_session=False)
+        db.commit()
+
     # Calculate new due date
-    new_due_date = datetime.now() + timedelta(days=retention_days)
+    new_due_date = now + timedelta(days=retention_days)
     
     try:
         # Call DES API to set retention policy
-        async with httpx.AsyncClient() as client:
-            response = await client.put(
-                f"{DES_API_URL}/files/{file_record.uid}/retention-policy",
-                json={
-                    "created_at": file_record.created_at.isoformat(),
-                    "due_date": new_due_date.isoformat()
-                },
-                timeout=30.0
-            )
+        response = await des_client.put(
+            f"/files/{file_record.uid}/retention-policy",
+            json={
+                "created_at": file_record.created_at.isoformat(),
+                "due_date": new_due_date.isoformat()
+            }
+        )
     except httpx.RequestError as e:
+        release_claim()
         logger.error(f"DES API request failed: {str(e)}")
         raise HTTPException(status_code=503, detail=f"DES API unavailable: {str(e)}") from e
     
     if response.status_code != 200:
+        release_claim()
         raise HTTPException(
             status_code=response.status_code,
             detail=f"DES API error: {response.text}"
@@ -227,7 +351,6 @@ async def extend_retention(
     
     des_result = response.json()
     previous_due_date = file_record.extended_retention_due_date
-    updated_at = datetime.now()
     
     if file_record.status in {"active", "expired"}:
         new_status = "extended"
@@ -239,7 +362,7 @@ async def extend_retention(
     try:
         file_record.extended_retention_due_date = new_due_date
         file_record.retention_reason = reason
-        file_record.retention_updated_at = updated_at
+        file_record.retention_updated_at = now
         file_record.retention_updated_by = updated_by
         file_record.status = new_status
         file_record.in_extended_retention = True
@@ -250,7 +373,8 @@ async def extend_retention(
             previous_due_date=previous_due_date,
             new_due_date=new_due_date,
             reason=reason,
-            updated_by=updated_by
+            updated_by=updated_by,
+            updated_at=now
         )
         
         db.add(history)
@@ -269,23 +393,38 @@ async def extend_retention(
         "message": "Retention extended successfully"
     }
 
-@app.get("/api/files/{file_id}/retention-history")
-async def get_retention_history(file_id: int, db: Session = next(get_db())):
+@app.get("/api/files/{file_id}/retention-history", response_class=ORJSONResponse)
+async def get_retention_history(file_id: int, db: Session = Depends(get_db)):
     """Get retention change history for a file"""
-    history = db.query(RetentionHistoryRecord).filter(
-        RetentionHistoryRecord.file_id == file_id
-    ).order_by(RetentionHistoryRecord.updated_at.desc()).all()
+    rows = db.execute(
+        select(
+            RetentionHistoryRecord.previous_due_date,
+            RetentionHistoryRecord.new_due_date,
+            RetentionHistoryRecord.reason,
+            RetentionHistoryRecord.updated_by,
+            RetentionHistoryRecord.updated_at,
+        )
+        .where(RetentionHistoryRecord.file_id == file_id)
+        .order_by(RetentionHistoryRecord.updated_at.desc())
+    ).mappings()
     
-    return [
-        {
-            "previous_due_date": h.previous_due_date.isoformat() if h.previous_due_date else None,
-            "new_due_date": h.new_due_date.isoformat(),
-            "reason": h.reason,
-            "updated_by": h.updated_by,
-            "updated_at": h.updated_at.isoformat()
-        }
-        for h in history
-    ]
+    # Raw datetimes/None go straight to orjson, which formats them in C; returning the
+    # response directly also skips FastAPI's jsonable_encoder pass.
+    return ORJSONResponse([dict(row) for row in rows])
+
+@app.post("/api/archive/advance")
+async def advance_archive_watermark(db: Session = Depends(get_db)):
+    """Advance the archive watermark to midnight of (now - lag_days)"""
+    row = db.execute(text(ADVANCE_WATERMARK_SQL)).first()
+    db.commit()
+    if row is None:
+        config = db.get(ArchiveConfigRecord, 1)
+        if config is None:
+            raise HTTPException(status_code=404, detail="des_archive_config not initialized")
+        return {"archived_until": config.archived_until, "lag_days": config.lag_days, "advanced": False}
+    
+    logger.info("Archive watermark advanced to %s", row.archived_until)
+    return {"archived_until": row.archived_until, "lag_days": row.lag_days, "advanced": True}
 
 @app.get("/health")
 async def health_check():
@@ -293,21 +432,9 @@ async def health_check():
     return {
         "status": "healthy",
         "service": "business-system-mock",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
-# Helper functions
-def calculate_days_until_expiration(file_record: FileRecord) -> Optional[int]:
-    """Calculate days until file expiration"""
-    if file_record.extended_retention_due_date:
-        delta = file_record.extended_retention_due_date - datetime.now()
-        return max(0, delta.days)
-    elif file_record.created_at:
-        expiration = file_record.created_at + timedelta(days=file_record.standard_retention_days)
-        delta = expiration - datetime.now()
-        return max(0, delta.days)
-    return None
-
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8080)
@@ -226,8 +226,8 @@ echo -e "${BLUE}=== Monitoring & Metrics ===${NC}"
 echo ""
 
 echo "22. Get system statistics:"
-curl -s ${BUSINESS_API}/api/files | jq '[
-  {
+curl -s "${BUSINESS_API}/api/files?limit=1000" | jq '[
+  .files | {
     total_files: length,
     extended_retention: [.[] | select(.in_extended_retention == true)] | length,
     active_files: [.[] | select(.status == "active")] | length
@@ -49,14 +49,23 @@ def create_test_database(db_path: str, num_records: int) -> None:
     """Create SQLite database with test data."""
     print(f"Creating test database with {num_records:,} records...")
     
-    conn = sqlite3.connect(db_path)
+    # Autocommit mode so the bulk load runs inside one explicit transaction
+    conn = sqlite3.connect(db_path, isolation_level=None)
     cursor = conn.cursor()
     
+    # Bulk-load tuning: no fsync per commit, in-memory temp storage, ~200 MB page cache
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-200000")
+    
+    cursor.execute("BEGIN")
+    
     # Create files table (per-record approach)
     cursor.execute("""
         CREATE TABLE files (
             uid TEXT PRIMARY KEY,
-            created_at TIMESTAMP NOT NULL,
+            created_at INTEGER NOT NULL,  -- epoch seconds (integer range scans)
             file_location TEXT NOT NULL,
             size_bytes INTEGER,
             archived INTEGER DEFAULT 0
@@ -74,7 +83,7 @@ def create_test_database(db_path: str, num_records: int) -> None:
     cursor.execute("""
         CREATE TABLE des_archive_config (
             id INTEGER PRIMARY KEY,
-            archived_until TIMESTAMP NOT NULL,
+            archived_until INTEGER NOT NULL,  -- epoch seconds
             lag_days INTEGER NOT NULL
         )
     """)
@@ -83,36 +92,36 @@ def create_test_database(db_path: str, num_records: int) -> None:
     base_date = datetime(2024, 11, 1, tzinfo=timezone.utc)
     cursor.execute(
         "INSERT INTO des_archive_config VALUES (1, ?, 7)",
-        (base_date.isoformat(),)
+        (int(base_date.timestamp()),)
     )
     
     # Insert test files
     print(f"Inserting {num_records:,} test records...")
     batch_size = 10000
     
+    base_ts = int(base_date.timestamp())
+    
     for batch_start in range(0, num_records, batch_size):
-        batch = []
-        for i in range(batch_start, min(batch_start + batch_size, num_records)):
-            # Spread files over 30 days
-            days_offset = (i * 30) // num_records
-            created_at = base_date + timedelta(days=days_offset)
-            
-            batch.append((
-                f"file-{i:08d}",
-                created_at.isoformat(),
-                f"/data/files/file-{i:08d}.dat",
-                1024 * 1024  # 1MB
-            ))
-        
+        batch_end = min(batch_start + batch_size, num_records)
         cursor.executemany(
             "INSERT INTO files VALUES (?, ?, ?, ?, 0)",
-            batch
+            (
+                (
+                    f"file-{i:08d}",
+                    base_ts + ((i * 30) // num_records) * 86400,  # Spread files over 30 days
+                    f"/data/files/file-{i:08d}.dat",
+                    1024 * 1024,  # 1MB
+                )
+                for i in range(batch_start, batch_end)
+            )
         )
         
-        if (batch_start + batch_size) % 100000 == 0:
-            print(f"  Inserted {batch_start + batch_size:,} records...")
+        if batch_end % 100000 == 0:
+            print(f"  Inserted {batch_end:,} records...")
     
-    conn.commit()
+    cursor.execute("COMMIT")
+    # WAL is persistent in the file; return to the default journal so both compared runs start from the same setup
+    cursor.execute("PRAGMA journal_mode=DELETE")
     conn.close()
     print("✅ Test database created\n")
 
@@ -124,7 +133,7 @@ def demo_per_record_approach(db_path: str, batch_size: int = 1000) -> None:
     cursor = conn.cursor()
     
     with PerformanceTracker("Per-Record Approach") as tracker:
-        cutoff = datetime.now(timezone.utc)
+        cutoff_ts = int(datetime.now(timezone.utc).timestamp())
         
         while True:
             # SELECT files to archive
@@ -135,7 +144,7 @@ def demo_per_record_approach(db_path: str, batch_size: int = 1000) -> None:
                 WHERE created_at < ? AND archived = 0
                 ORDER BY created_at
                 LIMIT ?
-            """, (cutoff.isoformat(), batch_size))
+            """, (cutoff_ts, batch_size))
             
             rows = cursor.fetchall()
             if not rows:
@@ -148,13 +157,12 @@ def demo_per_record_approach(db_path: str, batch_size: int = 1000) -> None:
             time.sleep(0.01)
             
             # UPDATE archived = 1 for processed files
-            uids = [row[0] for row in rows]
-            tracker.db_operations["UPDATE"] += 1
+            # (one prepared statement re-bound per row, so every row still costs one UPDATE)
+            tracker.db_operations["UPDATE"] += len(rows)
             
-            placeholders = ','.join('?' * len(uids))
-            cursor.execute(
-                f"UPDATE files SET archived = 1 WHERE uid IN ({placeholders})",
-                uids
+            cursor.executemany(
+                "UPDATE files SET archived = 1 WHERE uid = ?",
+                ((row[0],) for row in rows)
             )
             conn.commit()
     
@@ -172,21 +180,23 @@ async def demo_watermark_approach(db_path: str, page_size: int = 10000) -> None:
         tracker.db_operations["SELECT"] += 1
         cursor.execute("SELECT archived_until, lag_days FROM des_archive_config WHERE id = 1")
         row = cursor.fetchone()
-        archived_until = datetime.fromisoformat(row[0])
+        archived_until_ts = row[0]
         lag_days = row[1]
         
         # Compute window
         target_cutoff = datetime.now(timezone.utc) - timedelta(days=lag_days)
         target_cutoff = target_cutoff.replace(hour=0, minute=0, second=0, microsecond=0)
+        target_cutoff_ts = int(target_cutoff.timestamp())
         
+        archived_until = datetime.fromtimestamp(archived_until_ts, timezone.utc)
         print(f"  Window: {archived_until.date()} → {target_cutoff.date()}")
         
-        if target_cutoff <= archived_until:
+        if target_cutoff_ts <= archived_until_ts:
             print("  No new files to archive")
             return
         
-        # Process files in window (with pagination)
-        last_created_at = archived_until
+        # Process files in window (with pagination on integer timestamps)
+        last_created_ts = archived_until_ts
         last_uid = ""
         
         while True:
@@ -201,10 +211,10 @@ async def demo_watermark_approach(db_path: str, page_size: int = 10000) -> None:
                 ORDER BY created_at, uid
                 LIMIT ?
             """, (
-                archived_until.isoformat(),
-                target_cutoff.isoformat(),
-                last_created_at.isoformat(),
-                last_created_at.isoformat(),
+                archived_until_ts,
+                target_cutoff_ts,
+                last_created_ts,
+                last_created_ts,
                 last_uid,
                 page_size
             ))
@@ -217,7 +227,7 @@ async def demo_watermark_approach(db_path: str, page_size: int = 10000) -> None:
             tracker.files_processed += len(rows)
             
             # Update pagination cursor
-            last_created_at = datetime.fromisoformat(rows[-1][1])
+            last_created_ts = rows[-1][1]
             last_uid = rows[-1][0]
             
             # Simulate packing (just a small delay)
@@ -228,7 +238,7 @@ async def demo_watermark_approach(db_path: str, page_size: int = 10000) -> None:
             tracker.db_operations["UPDATE"] += 1
             cursor.execute(
                 "UPDATE des_archive_config SET archived_until = ? WHERE id = 1",
-                (target_cutoff.isoformat(),)
+                (target_cutoff_ts,)
             )
             conn.commit()
             print(f"  ✅ Advanced watermark to {target_cutoff.date()}")
@@ -250,7 +260,7 @@ def reset_database(db_path: str) -> None:
     base_date = datetime(2024, 11, 1, tzinfo=timezone.utc)
     cursor.execute(
         "UPDATE des_archive_config SET archived_until = ? WHERE id = 1",
-        (base_date.isoformat(),)
+        (int(base_date.timestamp()),)
     )
     
     conn.commit()
@@ -282,7 +292,7 @@ def show_summary(db_path: str) -> None:
     print("="*60)
     print(f"Per-Record archived count: {archived_per_record:,}")
     print(f"Watermark archived count:  {archived_watermark:,}")
-    print(f"Current watermark:         {watermark}")
+    print(f"Current watermark:         {datetime.fromtimestamp(watermark, timezone.utc).isoformat()}")
     print("="*60 + "\n")
     
     conn.close()
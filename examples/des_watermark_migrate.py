@@ -9,18 +9,17 @@ Usage:
 
 import argparse
 import asyncio
+import copy
 import logging
+import os
+import signal
 import sys
-from datetime import datetime, timezone
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-import psycopg
-import yaml
-from watermark_orchestrator import WatermarkMigrationOrchestrator
-
-from des_core.archive_config import ArchiveConfigRepository
-from des_core.database_source import SourceDatabaseConfig
-from des_core.packer_planner import PackerConfig
+# psycopg, yaml, des_core and the orchestrator are imported inside the command handlers so that
+# `--help` and the lightweight subcommands do not pay for importing the whole stack.
 
 logging.basicConfig(
     level=logging.INFO,
@@ -28,24 +27,108 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Parsed configs keyed by path; entries are invalidated when the file's mtime or size changes.
+_CONFIG_CACHE: "OrderedDict[str, tuple[int, int, dict]]" = OrderedDict()
+_CONFIG_CACHE_MAX_ENTRIES = 100
+
+# Same message ArchiveConfigRepository.get_config raises when the singleton row is missing.
+_CONFIG_NOT_INITIALIZED = "des_archive_config not initialized; call ensure_initialized first."
+
 
 def load_config(config_path: str) -> dict:
-    """Load YAML configuration file."""
-    with open(config_path) as f:
-        return yaml.safe_load(f)
+    """Load YAML configuration file (cached until the file changes on disk)."""
+    key = os.path.abspath(config_path)
+    st = os.stat(key)
+    cached = _CONFIG_CACHE.get(key)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        _CONFIG_CACHE.move_to_end(key)
+        return copy.deepcopy(cached[2])
+    
+    import yaml
+    
+    # libyaml-backed loader when PyYAML was built with it
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(key) as f:
+        config = yaml.load(f, Loader=loader)
+    
+    _CONFIG_CACHE[key] = (st.st_mtime_ns, st.st_size, config)
+    _CONFIG_CACHE.move_to_end(key)
+    if len(_CONFIG_CACHE) > _CONFIG_CACHE_MAX_ENTRIES:
+        _CONFIG_CACHE.popitem(last=False)
+    return copy.deepcopy(config)
+
+
+def _same_database(url_a: str, url_b: str) -> bool:
+    """Return True if both connection strings point at the same database.
+
+    Compares parsed conninfo rather than raw strings, so `postgres://u@h` and `postgresql://u@h/`
+    (or the key=value form) are recognised as one database and can share a connection.
+    """
+    from psycopg.conninfo import conninfo_to_dict
+    
+    if url_a == url_b:
+        return True
+    try:
+        return conninfo_to_dict(url_a) == conninfo_to_dict(url_b)
+    except Exception:
+        return False
+
+
+async def _open_connections(connect, db_url: str, config_db_url: str) -> tuple:
+    """Open the source and config connections, sharing one when both name the same database.
+
+    `connect` is an async callable taking a URL. Distinct databases are connected concurrently so the
+    two DNS/TCP/TLS/startup handshakes overlap; if either fails, the other is closed before re-raising.
+    """
+    if _same_database(config_db_url, db_url):
+        conn = await connect(db_url)
+        return conn, conn
+    
+    results = await asyncio.gather(connect(db_url), connect(config_db_url), return_exceptions=True)
+    failures = [r for r in results if isinstance(r, BaseException)]
+    if failures:
+        for opened in results:
+            if not isinstance(opened, BaseException):
+                closing = opened.close()
+                if asyncio.iscoroutine(closing):
+                    await closing
+        raise failures[0]
+    return results[0], results[1]
 
 
 async def run_migration(config_path: str, mode: str = "single", interval: int = 3600):
     """Run watermark migration in single or continuous mode."""
+    import psycopg
+    
     config = load_config(config_path)
     
-    # Database connection
+    # Database + config connections (may be the same); the orchestrator drives DB-API connections,
+    # so connect off the event loop
     db_url = config["database"]["url"]
-    conn = psycopg.connect(db_url)
-    
-    # Config connection (may be same as db)
     config_db_url = config.get("watermark", {}).get("config_db_url", db_url)
-    config_conn = psycopg.connect(config_db_url) if config_db_url != db_url else conn
+    connect_timeout = config["database"].get("connect_timeout", 10)
+    conn, config_conn = await _open_connections(
+        lambda url: asyncio.to_thread(psycopg.connect, url, connect_timeout=connect_timeout),
+        db_url,
+        config_db_url,
+    )
+    
+    try:
+        await _run_orchestrator(config, conn, config_conn, mode, interval)
+    finally:
+        conn.close()
+        if config_conn is not conn:
+            config_conn.close()
+
+
+async def _run_orchestrator(config: dict, conn, config_conn, mode: str, interval: int) -> None:
+    """Build the orchestrator on open connections and run the requested mode."""
+    from watermark_orchestrator import WatermarkMigrationOrchestrator
+    
+    from des_core.database_source import SourceDatabaseConfig
+    from des_core.packer_planner import PackerConfig
+    
+    db_url = config["database"]["url"]
     
     # Source config
     source_config = SourceDatabaseConfig(
@@ -72,6 +155,8 @@ async def run_migration(config_path: str, mode: str = "single", interval: int =
         source_config=source_config,
         packer_config=packer_config,
         delete_source_files=config.get("migration", {}).get("delete_source_files", False),
+        adaptive_page_size=config.get("migration", {}).get("adaptive_page_size", False),
+        target_ms_per_row=tuple(config.get("migration", {}).get("target_ms_per_row", (0.5, 5.0))),
     )
     
     # Initialize
@@ -83,107 +168,136 @@ async def run_migration(config_path: str, mode: str = "single", interval: int =
         logger.info("Running single migration cycle...")
         result = await orchestrator.run_cycle()
         
-        print("\n" + "="*60)
-        print("Migration Cycle Complete")
-        print("="*60)
-        print(f"Window:          {result.window_start} → {result.window_end}")
-        print(f"Files processed: {result.files_processed:,}")
-        print(f"Files migrated:  {result.files_migrated:,}")
-        print(f"Files failed:    {result.files_failed:,}")
-        print(f"Shards created:  {result.shards_created:,}")
-        print(f"Total size:      {result.total_size_bytes / (1024**3):.2f} GB")
-        print(f"Duration:        {result.duration_seconds:.1f}s")
-        print(f"Throughput:      {result.total_size_bytes / (1024**2) / result.duration_seconds:.1f} MB/s")
+        # Empty or instantaneous cycles report 0 MB/s instead of dividing by zero
+        mbps = (
+            result.total_size_bytes / (1024**2) / result.duration_seconds
+            if result.duration_seconds > 0
+            else 0.0
+        )
+        lines = [
+            "",
+            "="*60,
+            "Migration Cycle Complete",
+            "="*60,
+            f"Window:          {result.window_start} → {result.window_end}",
+            f"Files processed: {result.files_processed:,}",
+            f"Files migrated:  {result.files_migrated:,}",
+            f"Files failed:    {result.files_failed:,}",
+            f"Shards created:  {result.shards_created:,}",
+            f"Total size:      {result.total_size_bytes / (1024**3):.2f} GB",
+            f"Duration:        {result.duration_seconds:.1f}s",
+            f"Throughput:      {mbps:.1f} MB/s",
+        ]
         if result.errors:
-            print(f"\nErrors ({len(result.errors)}):")
-            for error in result.errors[:10]:  # Show first 10
-                print(f"  - {error}")
-        print("="*60 + "\n")
+            lines.append(f"\nErrors ({len(result.errors)}):")
+            lines.extend(f"  - {error}" for error in result.errors[:10])  # Show first 10
+        lines.append("="*60 + "\n")
+        sys.stdout.write("\n".join(lines) + "\n")
         
     elif mode == "continuous":
         # Run continuously
         logger.info("Running in continuous mode (interval=%ds)...", interval)
         cycle_count = 0
         
-        while True:
-            try:
-                cycle_count += 1
-                logger.info("Starting cycle %d...", cycle_count)
-                
-                result = await orchestrator.run_cycle()
-                
-                logger.info(
-                    "Cycle %d complete: processed=%d, migrated=%d, failed=%d, duration=%.1fs",
-                    cycle_count,
-                    result.files_processed,
-                    result.files_migrated,
-                    result.files_failed,
-                    result.duration_seconds,
-                )
-                
-                # Sleep until next cycle
-                logger.info("Sleeping for %d seconds...", interval)
-                await asyncio.sleep(interval)
+        # SIGTERM cancels the running task so shutdown interrupts a sleep instead of waiting it out
+        loop = asyncio.get_running_loop()
+        current_task = asyncio.current_task()
+        try:
+            loop.add_signal_handler(signal.SIGTERM, current_task.cancel)
+            sigterm_installed = True
+        except NotImplementedError:  # pragma: no cover - e.g. Windows event loops
+            sigterm_installed = False
+        
+        try:
+            while True:
+                try:
+                    cycle_count += 1
+                    logger.info("Starting cycle %d...", cycle_count)
+                    
+                    result = await orchestrator.run_cycle()
+                    
+                    logger.info(
+                        "Cycle %d complete: processed=%d, migrated=%d, failed=%d, duration=%.1fs",
+                        cycle_count,
+                        result.files_processed,
+                        result.files_migrated,
+                        result.files_failed,
+                        result.duration_seconds,
+                    )
+                    logger.info("Sleeping for %d seconds...", interval)
+                except asyncio.CancelledError:
+                    logger.info("Received shutdown signal, shutting down...")
+                    break
+                except Exception as e:
+                    logger.error("Cycle failed: %s", e, exc_info=True)
+                    logger.info("Retrying in %d seconds...", interval)
                 
-            except KeyboardInterrupt:
-                logger.info("Received interrupt, shutting down...")
-                break
-            except Exception as e:
-                logger.error("Cycle failed: %s", e, exc_info=True)
-                logger.info("Retrying in %d seconds...", interval)
-                await asyncio.sleep(interval)
-    
-    # Cleanup
-    conn.close()
-    if config_conn != conn:
-        config_conn.close()
+                # One sleep for both paths, so a SIGTERM during the retry wait also shuts down cleanly
+                try:
+                    await asyncio.sleep(interval)
+                except asyncio.CancelledError:
+                    logger.info("Received shutdown signal, shutting down...")
+                    break
+        finally:
+            if sigterm_installed:
+                loop.remove_signal_handler(signal.SIGTERM)
 
 
 async def show_stats(config_path: str):
     """Show migration statistics and pending files."""
+    import psycopg
+    
+    from des_core.archive_config import ArchiveWindow, floor_to_midnight
+    
     config = load_config(config_path)
     
     db_url = config["database"]["url"]
-    conn = psycopg.connect(db_url)
-    
     config_db_url = config.get("watermark", {}).get("config_db_url", db_url)
-    config_conn = psycopg.connect(config_db_url) if config_db_url != db_url else conn
-    
-    # Get watermark info
-    repo = ArchiveConfigRepository(config_conn)
-    archived_until, lag_days = await repo.get_config()
-    window = await repo.compute_window(datetime.now(timezone.utc))
-    
-    # Query pending files
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT 
-            COUNT(*) as count,
-            MIN(created_at) as oldest,
-            MAX(created_at) as newest,
-            SUM(size_bytes) as total_bytes
-        FROM files
-        WHERE created_at > %s AND created_at <= %s
-    """, (window.window_start, window.window_end))
-    
-    row = cursor.fetchone()
-    pending_count = row[0] or 0
-    oldest = row[1]
-    newest = row[2]
-    total_bytes = row[3] or 0
-    
-    # Query archived files
-    cursor.execute("""
-        SELECT 
-            COUNT(*) as count,
-            SUM(size_bytes) as total_bytes
-        FROM files
-        WHERE created_at <= %s
-    """, (archived_until,))
-    
-    row = cursor.fetchone()
-    archived_count = row[0] or 0
-    archived_bytes = row[1] or 0
+    
+    connect_timeout = config["database"].get("connect_timeout", 10)
+    conn, config_conn = await _open_connections(
+        lambda url: psycopg.AsyncConnection.connect(url, connect_timeout=connect_timeout),
+        db_url,
+        config_db_url,
+    )
+    
+    try:
+        # Get watermark info
+        cursor = await config_conn.execute("SELECT archived_until, lag_days FROM des_archive_config WHERE id = 1")
+        config_row = await cursor.fetchone()
+        if config_row is None:
+            raise RuntimeError(_CONFIG_NOT_INITIALIZED)
+        archived_until, lag_days = config_row
+        window = ArchiveWindow(
+            window_start=archived_until,
+            window_end=floor_to_midnight(datetime.now(timezone.utc) - timedelta(days=lag_days)),
+            lag_days=lag_days,
+        )
+        
+        # Pending window and archived totals in one round-trip
+        cursor = await conn.execute("""
+            SELECT 
+                COUNT(*) FILTER (WHERE created_at > %(start)s AND created_at <= %(end)s) as pending_count,
+                MIN(created_at) FILTER (WHERE created_at > %(start)s AND created_at <= %(end)s) as oldest,
+                MAX(created_at) FILTER (WHERE created_at > %(start)s AND created_at <= %(end)s) as newest,
+                SUM(size_bytes) FILTER (WHERE created_at > %(start)s AND created_at <= %(end)s) as pending_bytes,
+                COUNT(*) FILTER (WHERE created_at <= %(archived_until)s) as archived_count,
+                SUM(size_bytes) FILTER (WHERE created_at <= %(archived_until)s) as archived_bytes
+            FROM files
+            WHERE created_at <= GREATEST(%(end)s, %(archived_until)s)
+        """, {"start": window.window_start, "end": window.window_end, "archived_until": archived_until})
+        
+        row = await cursor.fetchone()
+        pending_count = row[0] or 0
+        oldest = row[1]
+        newest = row[2]
+        total_bytes = row[3] or 0
+        archived_count = row[4] or 0
+        archived_bytes = row[5] or 0
+    finally:
+        await conn.close()
+        if config_conn is not conn:
+            await config_conn.close()
     
     print("\n" + "="*70)
     print("DES Watermark Migration - Statistics")
@@ -216,55 +330,57 @@ async def show_stats(config_path: str):
         print(f"  Est. processing time: {est_duration / 60:.1f} minutes")
     
     print("\n" + "="*70 + "\n")
-    
-    conn.close()
-    if config_conn != conn:
-        config_conn.close()
 
 
 async def adjust_watermark(config_path: str, set_date: Optional[str] = None, days_offset: Optional[int] = None):
     """Manually adjust the watermark."""
+    import psycopg
+    
     config = load_config(config_path)
     
     config_db_url = config.get("watermark", {}).get("config_db_url", config["database"]["url"])
-    conn = psycopg.connect(config_db_url)
-    
-    cursor = conn.cursor()
     
-    # Get current watermark
-    cursor.execute("SELECT archived_until, lag_days FROM des_archive_config WHERE id = 1")
-    current_watermark, _lag_days = cursor.fetchone()
-    
-    print("\n⚠️  Watermark Adjustment")
-    print(f"Current watermark: {current_watermark}")
-    
-    if set_date:
-        # Set to specific date
-        new_watermark = datetime.fromisoformat(set_date)
-        cursor.execute(
-            "UPDATE des_archive_config SET archived_until = %s WHERE id = 1",
-            (new_watermark,)
-        )
-        conn.commit()
-        print(f"✅ Watermark set to: {new_watermark}")
+    connect_timeout = config["database"].get("connect_timeout", 10)
+    async with await psycopg.AsyncConnection.connect(config_db_url, connect_timeout=connect_timeout) as conn:
+        # Read the current watermark and apply the adjustment in one pipelined round-trip
+        update_cursor = None
+        async with conn.pipeline():
+            current_cursor = await conn.execute("SELECT archived_until, lag_days FROM des_archive_config WHERE id = 1")
+            
+            if set_date:
+                # Set to specific date
+                new_watermark = datetime.fromisoformat(set_date)
+                update_cursor = await conn.execute(
+                    "UPDATE des_archive_config SET archived_until = %s WHERE id = 1 RETURNING archived_until",
+                    (new_watermark,)
+                )
+            elif days_offset is not None:
+                # Adjust by days offset
+                update_cursor = await conn.execute(
+                    "UPDATE des_archive_config SET archived_until = archived_until + make_interval(days => %s::int) "
+                    "WHERE id = 1 RETURNING archived_until",
+                    (days_offset,)
+                )
+            
+            if update_cursor is not None:
+                await conn.commit()
         
-    elif days_offset is not None:
-        # Adjust by days offset
-        cursor.execute(
-            "UPDATE des_archive_config SET archived_until = archived_until + INTERVAL '%s days' WHERE id = 1",
-            (days_offset,)
-        )
-        conn.commit()
+        current_row = await current_cursor.fetchone()
+        if current_row is None:
+            # The UPDATE matched no row either, so nothing was changed
+            raise RuntimeError(_CONFIG_NOT_INITIALIZED)
+        current_watermark, _lag_days = current_row
+        print("\n⚠️  Watermark Adjustment")
+        print(f"Current watermark: {current_watermark}")
         
-        # Get new value
-        cursor.execute("SELECT archived_until FROM des_archive_config WHERE id = 1")
-        new_watermark = cursor.fetchone()[0]
-        print(f"✅ Watermark adjusted by {days_offset} days to: {new_watermark}")
-    
-    else:
-        print("❌ No adjustment specified (use --set-date or --days-offset)")
-    
-    conn.close()
+        if update_cursor is None:
+            print("❌ No adjustment specified (use --set-date or --days-offset)")
+        else:
+            new_watermark = (await update_cursor.fetchone())[0]
+            if set_date:
+                print(f"✅ Watermark set to: {new_watermark}")
+            else:
+                print(f"✅ Watermark adjusted by {days_offset} days to: {new_watermark}")
 
 
 def main():
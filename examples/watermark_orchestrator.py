@@ -12,7 +12,10 @@ Key differences from migration_orchestrator.py:
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
+import stat
 import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
@@ -20,7 +23,7 @@ from pathlib import Path
 from typing import List, Optional
 
 from des_core.archive_config import ArchiveConfigRepository, ArchiveWindow
-from des_core.database_source import DatabaseSourceProvider, SourceDatabaseConfig
+from des_core.database_source import DatabaseSourceProvider, SourceDatabaseConfig, SourceRecord
 from des_core.metrics import (
     DES_MIGRATION_BYTES_TOTAL,
     DES_MIGRATION_CYCLES_TOTAL,
@@ -34,6 +37,17 @@ from des_core.s3_file_reader import FileReaderProtocol, LocalFileReader, S3FileR
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent unlink() calls so cleanup does not monopolise the default executor.
+_CLEANUP_CONCURRENCY = 32
+
+# Bounds and smoothing for adaptive page sizing (see WatermarkMigrationOrchestrator._tune_page_size).
+_MIN_PAGE_SIZE = 256
+_MAX_PAGE_SIZE = 8192
+_MS_PER_ROW_EMA_ALPHA = 0.3
+
+# Local files are validated with one stat() each, this many per worker-thread job.
+_VALIDATE_CHUNK_SIZE = 64
+
 
 @dataclass
 class WatermarkMigrationResult:
@@ -72,6 +86,8 @@ class WatermarkMigrationOrchestrator:
         file_reader: Optional[FileReaderProtocol] = None,
         delete_source_files: bool = False,
         default_archived_until: Optional[datetime] = None,
+        adaptive_page_size: bool = False,
+        target_ms_per_row: tuple[float, float] = (0.5, 5.0),
     ):
         """Initialize watermark-based migration orchestrator.
         
@@ -83,6 +99,9 @@ class WatermarkMigrationOrchestrator:
             file_reader: FileReader implementation (LocalFileReader or S3FileReader)
             delete_source_files: Whether to delete source files after successful migration
             default_archived_until: Initial watermark if des_archive_config is empty
+            adaptive_page_size: Resize pages between batches based on observed processing time
+            target_ms_per_row: (low, high) per-row processing time band; faster doubles the page
+                size (up to 8192), slower halves it (down to 256)
         """
         self._db_source = DatabaseSourceProvider(db_connection, source_config)
         self._config_repo = ArchiveConfigRepository(config_connection)
@@ -90,6 +109,10 @@ class WatermarkMigrationOrchestrator:
         self._packer_config = packer_config
         self._file_reader = file_reader or LocalFileReader()
         self._delete_source = delete_source_files
+        self._page_size = source_config.page_size
+        self._adaptive_page_size = adaptive_page_size
+        self._target_ms_per_row = target_ms_per_row
+        self._ms_per_row_ema: Optional[float] = None
         
         # Initialize watermark if not exists
         if default_archived_until is None:
@@ -144,10 +167,15 @@ class WatermarkMigrationOrchestrator:
             # Step 2: Process files in window
             result = await self._execute_cycle(window)
             
-            # Step 3: Advance watermark (SINGLE UPDATE!)
+            # Step 3: Advance watermark (SINGLE UPDATE, guarded by the watermark this window was read from)
             if result.files_migrated > 0:
-                await self._config_repo.advance_cutoff(datetime.now(timezone.utc))
-                logger.info("Advanced watermark to %s", window.window_end.isoformat())
+                if await self._config_repo.advance_with_cas(window.window_start, window.window_end):
+                    logger.info("Advanced watermark to %s", window.window_end.isoformat())
+                else:
+                    logger.warning(
+                        "Watermark raced: archived_until moved away from %s during the cycle; not advancing",
+                        window.window_start.isoformat(),
+                    )
             
             # Update metrics
             DES_MIGRATION_FILES_TOTAL.inc(result.files_processed)
@@ -169,24 +197,18 @@ class WatermarkMigrationOrchestrator:
         start = time.monotonic()
         errors: List[str] = []
         
-        # Collect files from window
-        files_to_pack: List[tuple[str, str, datetime]] = []  # (uid, location, created_at)
         files_processed = 0
         
         logger.info("Fetching files from archive window...")
         
-        async for record in self._db_source.iter_records_for_window(window):
-            files_processed += 1
-            files_to_pack.append((record.uid, record.file_location, record.created_at))
-            
-            # Process in batches to avoid memory issues
-            if len(files_to_pack) >= self._source_config.page_size:
-                await self._process_batch(files_to_pack, errors)
-                files_to_pack.clear()
-        
-        # Process remaining files
-        if files_to_pack:
-            await self._process_batch(files_to_pack, errors)
+        # The provider hands over one keyset page at a time, so memory stays bounded by page_size;
+        # the size is re-read before each page so adaptive tuning applies mid-window
+        async for batch in self._db_source.iter_batches_for_window(window, page_size=lambda: self._page_size):
+            files_processed += len(batch)
+            batch_start = time.monotonic()
+            await self._process_batch(batch, errors)
+            if self._adaptive_page_size:
+                self._tune_page_size(len(batch), time.monotonic() - batch_start)
         
         logger.info(
             "Processed %d files from window (%s, %s]",
@@ -210,39 +232,33 @@ class WatermarkMigrationOrchestrator:
             errors=errors,
         )
 
+    def _tune_page_size(self, rows: int, seconds: float) -> None:
+        """Double or halve the page size based on an EMA of per-row processing time."""
+        ms_per_row = seconds * 1000 / rows
+        ema = self._ms_per_row_ema
+        ema = ms_per_row if ema is None else _MS_PER_ROW_EMA_ALPHA * ms_per_row + (1 - _MS_PER_ROW_EMA_ALPHA) * ema
+        self._ms_per_row_ema = ema
+        
+        target_lo, target_hi = self._target_ms_per_row
+        if ema < target_lo:
+            new_size = min(self._page_size * 2, _MAX_PAGE_SIZE)
+        elif ema > target_hi:
+            new_size = max(self._page_size // 2, _MIN_PAGE_SIZE)
+        else:
+            return
+        if new_size != self._page_size:
+            logger.debug("Page size %d -> %d (%.3f ms/row)", self._page_size, new_size, ema)
+            self._page_size = new_size
+
     async def _process_batch(
         self,
-        files: List[tuple[str, str, datetime]],
+        files: List[SourceRecord],
         errors: List[str],
     ) -> None:
         """Process a batch of files: validate, pack, optionally delete."""
         
         # Validate files
-        valid_files: List[tuple[str, str, datetime]] = []
-        
-        for uid, location, created_at in files:
-            try:
-                # Check if file exists and is readable
-                if location.startswith("s3://"):
-                    # S3 validation
-                    if not isinstance(self._file_reader, S3FileReader):
-                        errors.append(f"S3 location {location} but LocalFileReader configured")
-                        continue
-                else:
-                    # Local file validation
-                    path = Path(location)
-                    if not path.exists():
-                        errors.append(f"File not found: {location}")
-                        continue
-                    if not path.is_file():
-                        errors.append(f"Not a file: {location}")
-                        continue
-                
-                valid_files.append((uid, location, created_at))
-                
-            except Exception as e:
-                errors.append(f"Validation failed for {uid}: {e}")
-                logger.warning("Validation failed for uid=%s: %s", uid, e)
+        valid_files = await self._validate_batch(files, errors)
         
         if not valid_files:
             return
@@ -252,7 +268,7 @@ class WatermarkMigrationOrchestrator:
         
         try:
             # TODO: Integrate with actual pack_files function
-            # This would need conversion from our tuple format to expected format
+            # This would need conversion from SourceRecord to the packer's input format
             # pack_outcome = pack_files(
             #     file_records=valid_files,
             #     config=self._packer_config,
@@ -264,29 +280,88 @@ class WatermarkMigrationOrchestrator:
             
             # Optionally delete source files
             if self._delete_source:
-                self._cleanup_sources([f[1] for f in valid_files], errors)
+                await self._cleanup_sources([f.file_location for f in valid_files], errors)
                 
         except Exception as e:
             error_msg = f"Packing failed: {e}"
             errors.append(error_msg)
             logger.error(error_msg)
 
-    def _cleanup_sources(self, file_paths: List[str], errors: List[str]) -> None:
-        """Delete source files after successful migration."""
+    async def _validate_batch(
+        self,
+        files: List[SourceRecord],
+        errors: List[str],
+    ) -> List[SourceRecord]:
+        """Validate a batch: partition once by backend, then stat local files in concurrent chunks."""
+        problems: List[Optional[str]] = [None] * len(files)
+        
+        # Partition once; the reader type only needs checking once per batch
+        local_indices: List[int] = []
+        s3_indices: List[int] = []
+        for idx, record in enumerate(files):
+            if record.file_location.startswith("s3://"):
+                s3_indices.append(idx)
+            else:
+                local_indices.append(idx)
+        
+        # S3 validation
+        if s3_indices and not isinstance(self._file_reader, S3FileReader):
+            for idx in s3_indices:
+                problems[idx] = f"S3 location {files[idx].file_location} but LocalFileReader configured"
+        
+        # Local file validation: cost stays one stat() per file however large the source directory is
+        chunks = [
+            local_indices[start:start + _VALIDATE_CHUNK_SIZE]
+            for start in range(0, len(local_indices), _VALIDATE_CHUNK_SIZE)
+        ]
+        outcomes = await asyncio.gather(
+            *(
+                asyncio.to_thread(_check_local_files, [files[idx].file_location for idx in chunk])
+                for chunk in chunks
+            ),
+            return_exceptions=True,
+        )
+        for chunk, outcome in zip(chunks, outcomes):
+            if isinstance(outcome, BaseException):
+                for idx in chunk:
+                    problems[idx] = f"Validation failed for {files[idx].uid}: {outcome}"
+                    logger.warning("Validation failed for uid=%s: %s", files[idx].uid, outcome)
+                continue
+            for idx, problem in zip(chunk, outcome):
+                problems[idx] = problem
+        
+        valid_files: List[SourceRecord] = []
+        for record, problem in zip(files, problems):
+            if problem is None:
+                valid_files.append(record)
+            else:
+                errors.append(problem)
+        return valid_files
+
+    async def _cleanup_sources(self, file_paths: List[str], errors: List[str]) -> None:
+        """Delete source files after successful migration; local unlinks run concurrently."""
+        local_paths: List[str] = []
         for path_str in file_paths:
-            try:
-                if path_str.startswith("s3://"):
-                    # TODO: S3 deletion
-                    logger.warning("S3 deletion not implemented: %s", path_str)
-                else:
-                    path = Path(path_str)
-                    if path.exists():
-                        path.unlink()
-                        logger.debug("Deleted source file: %s", path_str)
-            except Exception as e:
-                error_msg = f"Failed to delete {path_str}: {e}"
+            if path_str.startswith("s3://"):
+                # TODO: S3 deletion
+                logger.warning("S3 deletion not implemented: %s", path_str)
+            else:
+                local_paths.append(path_str)
+        
+        semaphore = asyncio.Semaphore(_CLEANUP_CONCURRENCY)
+        
+        async def _unlink(path_str: str) -> None:
+            async with semaphore:
+                await asyncio.to_thread(Path(path_str).unlink, missing_ok=True)
+        
+        outcomes = await asyncio.gather(*(_unlink(p) for p in local_paths), return_exceptions=True)
+        for path_str, outcome in zip(local_paths, outcomes):
+            if isinstance(outcome, Exception):
+                error_msg = f"Failed to delete {path_str}: {outcome}"
                 errors.append(error_msg)
                 logger.warning(error_msg)
+            else:
+                logger.debug("Deleted source file: %s", path_str)
 
     def _empty_cycle_result(
         self,
@@ -311,10 +386,8 @@ class WatermarkMigrationOrchestrator:
         """Get statistics about pending files (for monitoring)."""
         window = await self._config_repo.compute_window(datetime.now(timezone.utc))
         
-        # Count files in window
-        count = 0
-        async for _ in self._db_source.iter_records_for_window(window):
-            count += 1
+        # Count files in window (server-side aggregate, no rows transferred)
+        count = await self._db_source.count_records_for_window(window)
         
         return {
             "pending_files": count,
@@ -324,6 +397,22 @@ class WatermarkMigrationOrchestrator:
         }
 
 
+def _check_local_files(locations: List[str]) -> List[Optional[str]]:
+    """Check a chunk of local files inside one worker-thread job."""
+    return [_check_local_file(location) for location in locations]
+
+
+def _check_local_file(location: str) -> Optional[str]:
+    """Return an error message if `location` is not an existing regular file (one stat() call)."""
+    try:
+        st = os.stat(location)
+    except (FileNotFoundError, NotADirectoryError):
+        return f"File not found: {location}"
+    if not stat.S_ISREG(st.st_mode):
+        return f"Not a file: {location}"
+    return None
+
+
 # Example usage:
 """
 import asyncio
@@ -1,79 +1,154 @@
-"""Core utilities for Datavision Easy Store (DES)."""
+"""Core utilities for Datavision Easy Store (DES).
 
-from .archive_config import ArchiveConfigRepository, ArchiveWindow, floor_to_midnight
-from .compression import (
-    CompressionCodec,
-    CompressionConfig,
-    CompressionProfile,
-    aggressive_zstd_config,
-    balanced_zstd_config,
-    speed_lz4_config,
-)
-from .config import DESConfig, S3SourceConfig
-from .database_source import DatabaseSourceProvider, SourceDatabaseConfig, SourceRecord
-from .db_archive_marker import advance_archive_marker
-from .db_connector import SourceDatabase, SourceFileRecord
-from .ext_retention import ExtendedRetentionManager
-from .http_retriever import (
-    HttpRetrieverSettings,
-    create_app,
-)
-from .metadata_manager import MetadataManager
-from .migration_orchestrator import MigrationOrchestrator, MigrationResult
-from .multi_s3_retriever import (
-    MultiS3ShardRetriever,
-    S3ZoneConfig,
-    S3ZoneRange,
-)
-from .packer import (
-    PackerResult,
-    ShardWriteResult,
-    pack_files_to_directory,
-)
-from .packer_planner import (
-    FileToPack,
-    PackPlan,
-    PlannedShard,
-    PlannerConfig,
-    ShardKey,
-    build_pack_plan,
-    estimate_shard_counts,
-)
-from .retriever import (
-    LocalRetrieverConfig,
-    LocalShardRetriever,
-    make_local_config,
-)
-from .routing import (
-    ShardLocation,
-    build_object_key,
-    compute_shard_index_from_uid,
-    format_date_dir,
-    locate_shard,
-    normalize_uid,
-    shard_index_to_hex,
-)
-from .s3_file_reader import S3FileReader, is_s3_uri
-from .s3_packer import (
-    S3PackerResult,
-    UploadedShard,
-    pack_files_to_s3,
-)
-from .s3_retriever import (
-    S3Config,
-    S3ShardRetriever,
-    S3ShardStorage,
-    normalize_prefix,
-)
-from .shard_io import (
-    ShardFileEntry,
-    ShardIndex,
-    ShardReader,
-    ShardWriter,
-)
-from .shard_metadata import ShardMetadata, TombstoneError
+Public names are resolved lazily on first access (PEP 562), so importing `des_core` does not pull in
+FastAPI, boto3 or the compression backends until a name that needs them is used.
+"""
 
-__all__ = [
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .archive_config import ArchiveConfigRepository, ArchiveWindow, floor_to_midnight
+    from .compression import (
+        CompressionCodec,
+        CompressionConfig,
+        CompressionProfile,
+        aggressive_zstd_config,
+        balanced_zstd_config,
+        speed_lz4_config,
+    )
+    from .config import DESConfig, S3SourceConfig
+    from .database_source import DatabaseSourceProvider, SourceDatabaseConfig, SourceRecord
+    from .db_archive_marker import advance_archive_marker
+    from .db_connector import SourceDatabase, SourceFileRecord
+    from .ext_retention import ExtendedRetentionManager
+    from .http_retriever import (
+        HttpRetrieverSettings,
+        create_app,
+    )
+    from .metadata_manager import MetadataManager
+    from .migration_orchestrator import MigrationOrchestrator, MigrationResult
+    from .multi_s3_retriever import (
+        MultiS3ShardRetriever,
+        S3ZoneConfig,
+        S3ZoneRange,
+    )
+    from .packer import (
+        PackerResult,
+        ShardWriteResult,
+        pack_files_to_directory,
+    )
+    from .packer_planner import (
+        FileToPack,
+        PackPlan,
+        PlannedShard,
+        PlannerConfig,
+        ShardKey,
+        build_pack_plan,
+        estimate_shard_counts,
+    )
+    from .retriever import (
+        LocalRetrieverConfig,
+        LocalShardRetriever,
+        make_local_config,
+    )
+    from .routing import (
+        ShardLocation,
+        build_object_key,
+        compute_shard_index_from_uid,
+        format_date_dir,
+        locate_shard,
+        normalize_uid,
+        shard_index_to_hex,
+    )
+    from .s3_file_reader import S3FileReader, is_s3_uri
+    from .s3_packer import (
+        S3PackerResult,
+        UploadedShard,
+        pack_files_to_s3,
+    )
+    from .s3_retriever import (
+        S3Config,
+        S3ShardRetriever,
+        S3ShardStorage,
+        normalize_prefix,
+    )
+    from .shard_io import (
+        ShardFileEntry,
+        ShardIndex,
+        ShardReader,
+        ShardWriter,
+    )
+    from .shard_metadata import ShardMetadata, TombstoneError
+
+# Public name -> defining submodule.
+_LAZY_ATTRS: dict[str, str] = {
+    "ArchiveConfigRepository": "archive_config",
+    "ArchiveWindow": "archive_config",
+    "floor_to_midnight": "archive_config",
+    "CompressionCodec": "compression",
+    "CompressionConfig": "compression",
+    "CompressionProfile": "compression",
+    "aggressive_zstd_config": "compression",
+    "balanced_zstd_config": "compression",
+    "speed_lz4_config": "compression",
+    "DESConfig": "config",
+    "S3SourceConfig": "config",
+    "DatabaseSourceProvider": "database_source",
+    "SourceDatabaseConfig": "database_source",
+    "SourceRecord": "database_source",
+    "advance_archive_marker": "db_archive_marker",
+    "SourceDatabase": "db_connector",
+    "SourceFileRecord": "db_connector",
+    "ExtendedRetentionManager": "ext_retention",
+    "HttpRetrieverSettings": "http_retriever",
+    "create_app": "http_retriever",
+    "MetadataManager": "metadata_manager",
+    "MigrationOrchestrator": "migration_orchestrator",
+    "MigrationResult": "migration_orchestrator",
+    "MultiS3ShardRetriever": "multi_s3_retriever",
+    "S3ZoneConfig": "multi_s3_retriever",
+    "S3ZoneRange": "multi_s3_retriever",
+    "PackerResult": "packer",
+    "ShardWriteResult": "packer",
+    "pack_files_to_directory": "packer",
+    "FileToPack": "packer_planner",
+    "PackPlan": "packer_planner",
+    "PlannedShard": "packer_planner",
+    "PlannerConfig": "packer_planner",
+    "ShardKey": "packer_planner",
+    "build_pack_plan": "packer_planner",
+    "estimate_shard_counts": "packer_planner",
+    "LocalRetrieverConfig": "retriever",
+    "LocalShardRetriever": "retriever",
+    "make_local_config": "retriever",
+    "ShardLocation": "routing",
+    "build_object_key": "routing",
+    "compute_shard_index_from_uid": "routing",
+    "format_date_dir": "routing",
+    "locate_shard": "routing",
+    "normalize_uid": "routing",
+    "shard_index_to_hex": "routing",
+    "S3FileReader": "s3_file_reader",
+    "is_s3_uri": "s3_file_reader",
+    "S3PackerResult": "s3_packer",
+    "UploadedShard": "s3_packer",
+    "pack_files_to_s3": "s3_packer",
+    "S3Config": "s3_retriever",
+    "S3ShardRetriever": "s3_retriever",
+    "S3ShardStorage": "s3_retriever",
+    "normalize_prefix": "s3_retriever",
+    "ShardFileEntry": "shard_io",
+    "ShardIndex": "shard_io",
+    "ShardReader": "shard_io",
+    "ShardWriter": "shard_io",
+    "ShardMetadata": "shard_metadata",
+    "TombstoneError": "shard_metadata",
+}
+
+__all__ = (
     "ShardLocation",
     "FileToPack",
     "ShardKey",
@@ -135,4 +210,17 @@ __all__ = [
     "DatabaseSourceProvider",
     "SourceDatabaseConfig",
     "SourceRecord",
-]
+)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # cache so later lookups bypass __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
@@ -7,13 +7,26 @@ archive cutoff advances.
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import Any, Protocol
+from datetime import datetime, tzinfo
+from functools import lru_cache
+from typing import Any, Callable, Protocol, TypeVar
+
+try:  # pragma: no cover - optional check
+    import sqlite3
+except Exception:  # pragma: no cover - defensive
+    sqlite3 = None  # type: ignore
+
+_T = TypeVar("_T")
 
 
 class SupportsExecute(Protocol):
-    """Minimal DB-API surface needed by the repository."""
+    """Minimal DB-API surface needed by the repository.
+
+    The repository issues statements through `execute` (which returns a cursor-like result) rather than
+    allocating a cursor per call; `cursor` stays in the contract for DB-API compatibility.
+    """
 
     def execute(self, sql: str, params: Any | None = None) -> Any: ...
 
@@ -34,7 +47,14 @@ class ArchiveWindow:
 def floor_to_midnight(dt: datetime) -> datetime:
     """Clamp a datetime to midnight, preserving tzinfo."""
 
-    return datetime(dt.year, dt.month, dt.day, tzinfo=dt.tzinfo)
+    return dt.replace(hour=0, minute=0, second=0, microsecond=0, fold=0)
+
+
+@lru_cache(maxsize=128)
+def _cutoff_for_day(date_ordinal: int, lag_days: int, tz: tzinfo | None) -> datetime:
+    """Midnight `lag_days` before the given day; invariant within a day, so cached."""
+
+    return datetime.fromordinal(date_ordinal - lag_days).replace(tzinfo=tz)
 
 
 def _coerce_datetime(value: Any) -> datetime:
@@ -50,16 +70,17 @@ class ArchiveConfigRepository:
 
     def __init__(self, conn: SupportsExecute):
         self._conn = conn
+        self._is_sqlite = sqlite3 is not None and isinstance(conn, sqlite3.Connection)
 
     async def ensure_initialized(self, default_archived_until: datetime, default_lag_days: int) -> None:
         """Create table + seed row if missing."""
 
-        self._ensure_initialized_sync(default_archived_until, default_lag_days)
+        await self._run(self._ensure_initialized_sync, default_archived_until, default_lag_days)
 
     async def get_config(self) -> tuple[datetime, int]:
         """Return (archived_until, lag_days)."""
 
-        return self._get_config_sync()
+        return await self._run(self._get_config_sync)
 
     async def compute_window(self, now: datetime) -> ArchiveWindow:
         """Compute window without persisting any updates."""
@@ -69,21 +90,26 @@ class ArchiveConfigRepository:
         return ArchiveWindow(window_start=archived_until, window_end=target_cutoff, lag_days=lag_days)
 
     async def advance_cutoff(self, now: datetime) -> ArchiveWindow:
-        """Advance archived_until if the computed cutoff moves forward."""
+        """Advance archived_until if the computed cutoff moves forward (read + guarded UPDATE in one worker call)."""
 
-        archived_until, lag_days = await self.get_config()
-        target_cutoff = self._compute_target_cutoff(now, lag_days)
-        if target_cutoff <= archived_until:
-            return ArchiveWindow(window_start=archived_until, window_end=archived_until, lag_days=lag_days)
+        return await self._run(self._advance_cutoff_sync, now)
 
-        self._update_archived_until_sync(target_cutoff)
-        return ArchiveWindow(window_start=archived_until, window_end=target_cutoff, lag_days=lag_days)
+    async def advance_with_cas(self, old: datetime, new: datetime) -> bool:
+        """Move archived_until from `old` to `new` in one statement; False if another writer moved it first."""
+
+        return await self._run(self._compare_and_set_sync, old, new)
+
+    async def _run(self, func: Callable[..., _T], *args: Any) -> _T:
+        """Run a sync helper off the event loop; sqlite connections are bound to their thread, so run inline."""
+
+        if self._is_sqlite:
+            return func(*args)
+        return await asyncio.to_thread(func, *args)
 
     # --- sync helpers (run in thread) ---
 
     def _ensure_initialized_sync(self, default_archived_until: datetime, default_lag_days: int) -> None:
-        cursor = self._conn.cursor()
-        cursor.execute(
+        self._conn.execute(
             """
             CREATE TABLE IF NOT EXISTS des_archive_config (
                 id INTEGER PRIMARY KEY,
@@ -92,36 +118,67 @@ class ArchiveConfigRepository:
             )
             """
         )
-        cursor.execute("SELECT archived_until, lag_days FROM des_archive_config WHERE id = 1")
-        row = cursor.fetchone()
-        if row is None:
-            cursor.execute(
-                "INSERT INTO des_archive_config (id, archived_until, lag_days) VALUES (1, ?, ?)",
-                (default_archived_until.isoformat(), default_lag_days),
-            )
-            self._conn.commit()
+        # Idempotent seed: concurrent workers booting together cannot race between a SELECT and an INSERT.
+        self._conn.execute(
+            "INSERT INTO des_archive_config (id, archived_until, lag_days) VALUES (1, ?, ?) "
+            "ON CONFLICT (id) DO NOTHING",
+            (self._timestamp_param(default_archived_until), default_lag_days),
+        )
+        self._conn.commit()
 
     def _get_config_sync(self) -> tuple[datetime, int]:
-        cursor = self._conn.cursor()
-        cursor.execute("SELECT archived_until, lag_days FROM des_archive_config WHERE id = 1")
-        row = cursor.fetchone()
+        row = self._conn.execute("SELECT archived_until, lag_days FROM des_archive_config WHERE id = 1").fetchone()
         if row is None:
             raise RuntimeError("des_archive_config not initialized; call ensure_initialized first.")
-        archived_until = _coerce_datetime(row[0])
+        value = row[0]
+        # Native drivers already hand back datetime; only sqlite's ISO text needs parsing.
+        archived_until = value if type(value) is datetime else _coerce_datetime(value)
         lag_days = int(row[1])
         return archived_until, lag_days
 
-    def _update_archived_until_sync(self, target_cutoff: datetime) -> None:
-        cursor = self._conn.cursor()
-        cursor.execute(
-            "UPDATE des_archive_config SET archived_until = ? WHERE id = 1",
-            (target_cutoff.isoformat(),),
+    def _advance_cutoff_sync(self, now: datetime) -> ArchiveWindow:
+        archived_until, lag_days = self._get_config_sync()
+        target_cutoff = self._compute_target_cutoff(now, lag_days)
+        if target_cutoff <= archived_until:
+            return ArchiveWindow(window_start=archived_until, window_end=archived_until, lag_days=lag_days)
+
+        # Guarded so a concurrent advance is never moved backwards; rowcount reports whether we won.
+        target_param = self._timestamp_param(target_cutoff)
+        cursor = self._conn.execute(
+            f"UPDATE des_archive_config SET archived_until = ? WHERE id = 1 AND {self._archived_until_cmp('<')}",
+            (target_param, target_param),
+        )
+        self._conn.commit()
+        if cursor.rowcount != 1:
+            return ArchiveWindow(window_start=archived_until, window_end=archived_until, lag_days=lag_days)
+        return ArchiveWindow(window_start=archived_until, window_end=target_cutoff, lag_days=lag_days)
+
+    def _compare_and_set_sync(self, old: datetime, new: datetime) -> bool:
+        cursor = self._conn.execute(
+            f"UPDATE des_archive_config SET archived_until = ? WHERE id = 1 AND {self._archived_until_cmp('=')}",
+            (self._timestamp_param(new), self._timestamp_param(old)),
         )
         self._conn.commit()
+        return cursor.rowcount == 1
+
+    def _timestamp_param(self, value: datetime) -> Any:
+        """Bind TIMESTAMP values natively; sqlite gets ISO text since its datetime adapter is deprecated on 3.12."""
+
+        if self._is_sqlite:
+            return value.isoformat()
+        return value
+
+    def _archived_until_cmp(self, op: str) -> str:
+        """Compare archived_until to a bound timestamp; sqlite compares instants, not ISO text spellings."""
+
+        if self._is_sqlite:
+            return f"julianday(archived_until) {op} julianday(?)"
+        return f"archived_until {op} ?"
 
     @staticmethod
     def _compute_target_cutoff(now: datetime, lag_days: int) -> datetime:
-        return floor_to_midnight(now - timedelta(days=lag_days))
+        # Same result as floor_to_midnight(now - timedelta(days=lag_days)): aware arithmetic is wall-clock.
+        return _cutoff_for_day(now.toordinal(), lag_days, now.tzinfo)
 
 
 # Quick-start summary (see README/task context):
@@ -3,14 +3,17 @@
 from __future__ import annotations
 
 import base64
+import binascii
 import hashlib
 import logging
 import os
 import signal
 import threading
-from collections import deque
-from dataclasses import dataclass
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Callable, Optional, Protocol, cast
 
@@ -19,16 +22,40 @@ import yaml
 from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import ec, ed25519, padding, rsa
+from requests.adapters import HTTPAdapter, Retry  # type: ignore[import-untyped]
 
 from .metrics import des_auth_requests_total
 
 logger = logging.getLogger(__name__)
 
 _DEFAULT_REQUEST_TIMEOUT = 10.0
+_OPENBAO_POOL_SIZE = 50
+_OPENBAO_RETRIES = 3
+_OPENBAO_BACKOFF_FACTOR = 0.3
+_OPENBAO_RETRY_STATUSES = (502, 503, 504)
 _K8S_TOKEN_PATH = "/var/run/secrets/kubernetes.io/serviceaccount/token"
 _MAX_CLOCK_SKEW = timedelta(minutes=5)
 _NONCE_TTL = timedelta(minutes=10)
 _RATE_LIMIT_WINDOW = timedelta(hours=1)
+_KEY_CACHE_SIZE = 4096
+# Key types _build_verifier can handle; anything else can never match an authorized entry.
+_SUPPORTED_KEY_TYPES = frozenset(
+    {b"ssh-ed25519", b"ssh-rsa", b"ecdsa-sha2-nistp256", b"ecdsa-sha2-nistp384", b"ecdsa-sha2-nistp521"}
+)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+# Default replay-cache ceiling: 1M nonces over the 10-minute TTL covers ~1,600 verified requests/s in total.
+_DEFAULT_MAX_NONCE_ENTRIES = 1_000_000
+_RATE_LIMIT_STRIPES = 64
+_MAX_CLOCK_SKEW_S = _MAX_CLOCK_SKEW.total_seconds()
+_NONCE_TTL_S = _NONCE_TTL.total_seconds()
+_RATE_LIMIT_WINDOW_S = _RATE_LIMIT_WINDOW.total_seconds()
+
+# Bound once so the per-request paths skip the labels() lookup.
+_M_INVALID = des_auth_requests_total.labels(result="invalid_sig")
+_M_EXPIRED = des_auth_requests_total.labels(result="expired")
+_M_RATE_LIMITED = des_auth_requests_total.labels(result="rate_limited")
+_M_SUCCESS = des_auth_requests_total.labels(result="success")
+_M_NONCE_CACHE_FULL = des_auth_requests_total.labels(result="nonce_cache_full")
 
 
 class _ResponseProtocol(Protocol):
@@ -56,24 +83,23 @@ class _SessionProtocol(Protocol):
         """Issue an HTTP request."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AuthorizedKey:
     public_key: bytes
     key_obj: Any
     permissions: list[str]
-    allowed_prefixes: Optional[list[str]]
-    excluded_prefixes: Optional[list[str]]
+    allowed_prefixes: Optional[tuple[str, ...]]
+    excluded_prefixes: Optional[tuple[str, ...]]
     expires_at: Optional[datetime]
     max_requests_per_hour: Optional[int]
     comment: Optional[str]
     fingerprint: str
+    verify_fn: Callable[[bytes, bytes], None] = field(repr=False, compare=False)
 
 
 def _parse_datetime(value: str) -> datetime:
-    raw = value.strip()
-    if raw.endswith("Z"):
-        raw = raw[:-1] + "+00:00"
-    parsed = datetime.fromisoformat(raw)
+    # fromisoformat accepts the "Z" suffix natively since Python 3.11.
+    parsed = datetime.fromisoformat(value.strip())
     if parsed.tzinfo is None:
         return parsed.replace(tzinfo=timezone.utc)
     return parsed.astimezone(timezone.utc)
@@ -85,6 +111,64 @@ def _fingerprint(public_key: bytes) -> str:
     return f"SHA256:{b64}"
 
 
+def _build_verifier(key_obj: Any) -> Callable[[bytes, bytes], None]:
+    """Bind the algorithm-specific verify call for a key; raises ValueError for unsupported key types."""
+
+    if isinstance(key_obj, ed25519.Ed25519PublicKey):
+        return cast(Callable[[bytes, bytes], None], key_obj.verify)
+    # Padding/hash parameters are immutable, so they are built once per key rather than per request.
+    if isinstance(key_obj, rsa.RSAPublicKey):
+        rsa_key = key_obj
+        rsa_padding = padding.PKCS1v15()
+        rsa_hash = hashes.SHA256()
+        return lambda signature, data: rsa_key.verify(signature, data, rsa_padding, rsa_hash)
+    if isinstance(key_obj, ec.EllipticCurvePublicKey):
+        ec_key = key_obj
+        ecdsa = ec.ECDSA(hashes.SHA256())
+        return lambda signature, data: ec_key.verify(signature, data, ecdsa)
+    raise ValueError(f"Unsupported public_key type: {type(key_obj).__name__}")
+
+
+@lru_cache(maxsize=_KEY_CACHE_SIZE)
+def _load_and_normalize(public_key_b64: str) -> tuple[bytes, Any, str]:
+    """Decode and parse a client public key header; returns (normalized_key, key_obj, fingerprint).
+
+    Clients send the same key on every request, so the parse/re-serialize round trip is cached. Invalid input raises
+    and is therefore never cached.
+    """
+    public_key_bytes = binascii.a2b_base64(public_key_b64, strict_mode=True)
+    key_type = public_key_bytes.split(b" ", 1)[0]
+    if key_type not in _SUPPORTED_KEY_TYPES:
+        raise ValueError(f"Unsupported public key type {key_type[:32]!r}")
+    key_obj = serialization.load_ssh_public_key(public_key_bytes)
+    normalized_key = key_obj.public_bytes(
+        encoding=serialization.Encoding.OpenSSH,
+        format=serialization.PublicFormat.OpenSSH,
+    )
+    return normalized_key, key_obj, _fingerprint(normalized_key)
+
+
+@lru_cache(maxsize=8)
+def _session_for(addr: str) -> Any:
+    """Return the session shared by every client of `addr`, pooled and with backoff on gateway errors."""
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=_OPENBAO_POOL_SIZE,
+        pool_maxsize=_OPENBAO_POOL_SIZE,
+        max_retries=Retry(
+            total=_OPENBAO_RETRIES,
+            backoff_factor=_OPENBAO_BACKOFF_FACTOR,
+            status_forcelist=_OPENBAO_RETRY_STATUSES,
+            # Hand the final 5xx back to raise_for_status so callers still see requests.HTTPError.
+            raise_on_status=False,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 class OpenBaoClient:
     """Client for OpenBao/Vault KV v2 authorized keys.
 
@@ -110,7 +194,7 @@ class OpenBaoClient:
         self._role = role or None
         self._mount = mount.strip("/")
         self._path = path.strip("/")
-        self._session: _SessionProtocol = requests.Session()
+        self._session: _SessionProtocol = _session_for(self._addr)
 
     def _request_json(
         self,
@@ -225,6 +309,8 @@ class PublicKeyAuthenticator:
         config_data: Optional[dict[str, Any]] = None,
         clock: Optional[Callable[[], datetime]] = None,
         openbao_client: Optional[OpenBaoClient] = None,
+        reload_interval: Optional[float] = None,
+        max_nonce_entries: Optional[int] = None,
     ) -> None:
         """Initialize a PublicKeyAuthenticator.
 
@@ -233,6 +319,10 @@ class PublicKeyAuthenticator:
             config_data: In-memory config override.
             clock: Optional clock provider for testing.
             openbao_client: Optional OpenBao/Vault client for loading authorized keys.
+            reload_interval: Optional period in seconds for re-reading keys on a background thread.
+            max_nonce_entries: Ceiling on the replay cache shared by all keys (default 1,000,000). Live nonces are
+                never evicted, so once it is reached every request is rejected as rate_limited until nonces expire.
+                Size it as nonce TTL (600 s) x expected peak verified requests/s.
 
         Raises:
             ValueError: If configuration cannot be loaded.
@@ -242,108 +332,204 @@ class PublicKeyAuthenticator:
         self._config_path = Path(config_path) if config_path else None
         self._config_data = config_data
         self._clock = clock or (lambda: datetime.now(timezone.utc))
+        # Nonce and rate-limit bookkeeping is local and only needs elapsed time; wall clock is kept for the skew check.
+        self._mono: Callable[[], float] = time.monotonic
         self._openbao_client = openbao_client
-        self._lock = threading.RLock()
+        self._config_stamp: Optional[tuple[int, int]] = None
+        self._cached_config: Optional[dict[str, Any]] = None
+        self._published_config: Optional[dict[str, Any]] = None
+        self._reload_lock = threading.Lock()
         self._authorized_keys: dict[bytes, AuthorizedKey] = {}
-        self._rate_limits: dict[str, deque[datetime]] = {}
-        self._nonce_cache: dict[str, datetime] = {}
+        self._b64_key_index: dict[str, AuthorizedKey] = {}
+        # Rate limits are striped by fingerprint so requests for different keys do not contend on one lock.
+        self._rate_limit_locks = [threading.Lock() for _ in range(_RATE_LIMIT_STRIPES)]
+        self._rate_limits: list[dict[str, deque[float]]] = [{} for _ in range(_RATE_LIMIT_STRIPES)]
+        self._nonce_lock = threading.Lock()
+        # Nonces are kept in insertion order so expiry only ever touches the oldest entries.
+        self._nonce_cache: OrderedDict[str, float] = OrderedDict()
+        if max_nonce_entries is not None and max_nonce_entries <= 0:
+            raise ValueError("max_nonce_entries must be positive")
+        self._max_nonce_entries = max_nonce_entries or _DEFAULT_MAX_NONCE_ENTRIES
+        if reload_interval is not None and reload_interval <= 0:
+            raise ValueError("reload_interval must be positive")
+        self._reload_interval = reload_interval
+        self._reload_event: Optional[threading.Event] = None
+        self._reload_stop = threading.Event()
+        self._reload_thread: Optional[threading.Thread] = None
         self.reload()
+        if reload_interval is not None:
+            self._start_reloader()
 
     def install_signal_handler(self) -> None:
-        """Enable SIGHUP reload when available."""
+        """Enable SIGHUP reload when available.
 
-        if hasattr(signal, "SIGHUP"):
-            signal.signal(signal.SIGHUP, lambda *_: self.reload())
+        The handler only wakes a background reloader thread, so the YAML/OpenBao fetch and key parsing never run
+        inside the signal handler or on a request thread.
+        """
+
+        if not hasattr(signal, "SIGHUP"):
+            return
+        reload_event = self._start_reloader()
+        signal.signal(signal.SIGHUP, lambda *_: reload_event.set())
+
+    def _start_reloader(self) -> threading.Event:
+        """Start the background reloader once; it runs on SIGHUP and, if configured, every `reload_interval`."""
+
+        if self._reload_event is None:
+            self._reload_event = threading.Event()
+            self._reload_thread = threading.Thread(target=self._reload_loop, name="des-auth-reload", daemon=True)
+            self._reload_thread.start()
+        return self._reload_event
+
+    def _reload_loop(self) -> None:
+        reload_event = self._reload_event
+        assert reload_event is not None
+        while True:
+            reload_event.wait(self._reload_interval)
+            if self._reload_stop.is_set():
+                return
+            reload_event.clear()
+            try:
+                self.reload()
+            except Exception:  # keep serving the previous keys
+                logger.exception("Authorized keys reload failed")
+
+    def close(self) -> None:
+        """Stop the background reloader, if one was started; the loaded keys stay usable."""
+
+        self._reload_stop.set()
+        if self._reload_event is not None:
+            self._reload_event.set()
+        if self._reload_thread is not None:
+            self._reload_thread.join()
+            self._reload_thread = None
+
+    def __enter__(self) -> "PublicKeyAuthenticator":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
 
     def reload(self) -> None:
         """Reload authorized keys from config."""
 
-        config = self._load_config()
-        keys = self._parse_config(config)
-        with self._lock:
-            self._authorized_keys = {entry.public_key: entry for entry in keys}
+        # Copy-on-write: the maps are never mutated after publication, so readers take no lock. The lock only
+        # serializes concurrent reloads (SIGHUP thread vs. explicit calls) around the config cache.
+        with self._reload_lock:
+            config = self._load_config()
+            if config is self._published_config:
+                # Unchanged YAML (cached by mtime) or in-memory config: the published maps are already current.
+                self._trim_rate_limits()
+                return
+            keys = self._parse_config(config)
+            authorized_keys = {entry.public_key: entry for entry in keys}
+            # Clients (see cli_auth) send base64 of the normalized OpenSSH line, so most requests match verbatim.
+            b64_key_index = {base64.b64encode(entry.public_key).decode("ascii"): entry for entry in keys}
+            self._authorized_keys = authorized_keys
+            self._b64_key_index = b64_key_index
+            self._published_config = config
+        self._trim_rate_limits()
         logger.info("Loaded %d authorized keys", len(keys))
 
     def verify_signature(
         self,
         public_key_b64: str,
         signature_b64: str,
-        canonical_data: str,
+        canonical_data: str | bytes,
         timestamp: str,
         nonce: str,
     ) -> tuple[bool, Optional[AuthorizedKey], Optional[str]]:
-        """Verify signature and return (is_valid, authorized_key, error_reason)."""
+        """Verify signature and return (is_valid, authorized_key, error_reason).
+
+        `canonical_data` may be passed as UTF-8 bytes to skip the encode step.
+        """
 
         now = self._clock()
+        mono_now = self._mono()
         try:
-            public_key_bytes = base64.b64decode(public_key_b64, validate=True)
-            signature = base64.b64decode(signature_b64, validate=True)
+            signature = binascii.a2b_base64(signature_b64, strict_mode=True)
         except (ValueError, TypeError) as exc:
             logger.warning("Invalid base64 auth header: %s", exc)
-            des_auth_requests_total.labels(result="invalid_sig").inc()
+            _M_INVALID.inc()
             return False, None, "invalid_sig"
 
-        try:
-            key_obj = serialization.load_ssh_public_key(public_key_bytes)
-        except (ValueError, TypeError) as exc:
-            logger.warning("Invalid public key: %s", exc)
-            des_auth_requests_total.labels(result="invalid_sig").inc()
-            return False, None, "invalid_sig"
+        authorized = self._b64_key_index.get(public_key_b64)
+        if authorized is not None:
+            fingerprint = authorized.fingerprint
+        else:
+            # Non-canonical encodings (e.g. a trailing comment) still need a parse to normalize the key.
+            try:
+                normalized_key, _, fingerprint = _load_and_normalize(public_key_b64)
+            except (ValueError, TypeError) as exc:
+                logger.warning("Invalid public key: %s", exc)
+                _M_INVALID.inc()
+                return False, None, "invalid_sig"
 
-        normalized_key = key_obj.public_bytes(
-            encoding=serialization.Encoding.OpenSSH,
-            format=serialization.PublicFormat.OpenSSH,
-        )
-        fingerprint = _fingerprint(normalized_key)
-
-        with self._lock:
             authorized = self._authorized_keys.get(normalized_key)
 
         if authorized is None:
             logger.warning("Unauthorized key fingerprint=%s", fingerprint)
-            des_auth_requests_total.labels(result="invalid_sig").inc()
+            _M_INVALID.inc()
             return False, None, "invalid_sig"
 
         if not timestamp or not nonce:
             logger.warning("Missing auth timestamp/nonce fingerprint=%s", fingerprint)
-            des_auth_requests_total.labels(result="invalid_sig").inc()
+            _M_INVALID.inc()
             return False, authorized, "invalid_sig"
 
         if authorized.expires_at and now > authorized.expires_at:
             logger.warning("Expired key fingerprint=%s", fingerprint)
-            des_auth_requests_total.labels(result="expired").inc()
+            _M_EXPIRED.inc()
             return False, authorized, "expired"
 
         try:
             ts = _parse_datetime(timestamp)
         except ValueError:
             logger.warning("Invalid auth timestamp fingerprint=%s", fingerprint)
-            des_auth_requests_total.labels(result="invalid_sig").inc()
+            _M_INVALID.inc()
             return False, authorized, "invalid_sig"
 
-        if abs(now - ts) > _MAX_CLOCK_SKEW:
+        skew = now.timestamp() - ts.timestamp()
+        if skew > _MAX_CLOCK_SKEW_S or skew < -_MAX_CLOCK_SKEW_S:
             logger.warning("Timestamp outside allowed skew fingerprint=%s", fingerprint)
-            des_auth_requests_total.labels(result="invalid_sig").inc()
+            _M_INVALID.inc()
             return False, authorized, "invalid_sig"
 
-        if self._is_nonce_reused(nonce, now):
+        if self._is_nonce_reused(nonce, mono_now):
             logger.warning("Replay nonce detected fingerprint=%s", fingerprint)
-            des_auth_requests_total.labels(result="invalid_sig").inc()
+            _M_INVALID.inc()
             return False, authorized, "invalid_sig"
 
         if authorized.max_requests_per_hour is not None:
-            if self._is_rate_limited(fingerprint, now, authorized.max_requests_per_hour):
+            if self._is_rate_limited(fingerprint, mono_now, authorized.max_requests_per_hour):
                 logger.warning("Rate limited fingerprint=%s", fingerprint)
-                des_auth_requests_total.labels(result="rate_limited").inc()
+                _M_RATE_LIMITED.inc()
                 return False, authorized, "rate_limited"
 
-        if not self._verify_signature_with_key(key_obj, signature, canonical_data):
+        canonical_bytes = canonical_data.encode("utf-8") if isinstance(canonical_data, str) else canonical_data
+        if not self._verify_signature_with_key(authorized, signature, canonical_bytes):
             logger.warning("Invalid signature fingerprint=%s", fingerprint)
-            des_auth_requests_total.labels(result="invalid_sig").inc()
+            _M_INVALID.inc()
             return False, authorized, "invalid_sig"
 
+        # Only a verified request may consume a nonce, so forged headers cannot burn or evict real ones.
+        claim_error = self._claim_nonce(nonce, mono_now)
+        if claim_error == "rate_limited":
+            # Global ceiling, not the per-key limit: counted separately so operators can tell the two apart.
+            logger.warning(
+                "Nonce cache full (%d entries), rejecting fingerprint=%s; raise max_nonce_entries",
+                self._max_nonce_entries,
+                fingerprint,
+            )
+            _M_NONCE_CACHE_FULL.inc()
+            return False, authorized, claim_error
+        if claim_error is not None:
+            logger.warning("Replay nonce detected fingerprint=%s", fingerprint)
+            _M_INVALID.inc()
+            return False, authorized, claim_error
+
         logger.info("Auth success fingerprint=%s", fingerprint)
-        des_auth_requests_total.labels(result="success").inc()
+        _M_SUCCESS.inc()
         return True, authorized, None
 
     def check_permission(self, authorized_key: AuthorizedKey, action: str, resource_path: str) -> bool:
@@ -352,12 +538,13 @@ class PublicKeyAuthenticator:
         if action not in authorized_key.permissions:
             return False
 
+        # str.startswith accepts a tuple and matches all prefixes in one call.
         if authorized_key.allowed_prefixes:
-            if not any(resource_path.startswith(prefix) for prefix in authorized_key.allowed_prefixes):
+            if not resource_path.startswith(authorized_key.allowed_prefixes):
                 return False
 
         if authorized_key.excluded_prefixes:
-            if any(resource_path.startswith(prefix) for prefix in authorized_key.excluded_prefixes):
+            if resource_path.startswith(authorized_key.excluded_prefixes):
                 return False
 
         return True
@@ -370,13 +557,19 @@ class PublicKeyAuthenticator:
             return self._openbao_client.get_authorized_keys()
         if self._config_path is None:
             raise ValueError("authorized_keys config path is required")
+        stat = self._config_path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._config_stamp and self._cached_config is not None:
+            return self._cached_config
         logger.info("Loading authorized keys from YAML")
         payload = self._config_path.read_text(encoding="utf-8")
-        value = yaml.safe_load(payload)
+        value = yaml.load(payload, Loader=_YAML_LOADER)
         if value is None:
-            return {}
+            value = {}
         if not isinstance(value, dict):
             raise ValueError("authorized keys config must be a mapping")
+        self._config_stamp = stamp
+        self._cached_config = value
         return value
 
     def _parse_config(self, data: dict[str, Any]) -> list[AuthorizedKey]:
@@ -403,6 +596,7 @@ class PublicKeyAuthenticator:
             encoding=serialization.Encoding.OpenSSH,
             format=serialization.PublicFormat.OpenSSH,
         )
+        verify_fn = _build_verifier(key_obj)
         permissions = entry.get("permissions", [])
         if not isinstance(permissions, list) or not all(isinstance(p, str) for p in permissions):
             raise ValueError("permissions must be a list of strings")
@@ -439,18 +633,32 @@ class PublicKeyAuthenticator:
             public_key=normalized_key,
             key_obj=key_obj,
             permissions=permissions,
-            allowed_prefixes=allowed,
-            excluded_prefixes=excluded,
+            allowed_prefixes=tuple(allowed) if allowed is not None else None,
+            excluded_prefixes=tuple(excluded) if excluded is not None else None,
             expires_at=expires_at,
             max_requests_per_hour=max_requests,
             comment=comment,
             fingerprint=_fingerprint(normalized_key),
+            verify_fn=verify_fn,
         )
 
-    def _is_rate_limited(self, fingerprint: str, now: datetime, limit: int) -> bool:
-        with self._lock:
-            queue = self._rate_limits.setdefault(fingerprint, deque())
-            cutoff = now - _RATE_LIMIT_WINDOW
+    def _trim_rate_limits(self) -> None:
+        """Free windows of keys no longer rate limited by the config, and windows whose requests have all expired."""
+
+        live = {entry.fingerprint for entry in self._authorized_keys.values() if entry.max_requests_per_hour is not None}
+        cutoff = self._mono() - _RATE_LIMIT_WINDOW_S
+        for lock, rate_limits in zip(self._rate_limit_locks, self._rate_limits):
+            with lock:
+                stale = [fp for fp, queue in rate_limits.items() if fp not in live or not queue or queue[-1] < cutoff]
+                for fingerprint in stale:
+                    del rate_limits[fingerprint]
+
+    def _is_rate_limited(self, fingerprint: str, now: float, limit: int) -> bool:
+        stripe = hash(fingerprint) & (_RATE_LIMIT_STRIPES - 1)
+        with self._rate_limit_locks[stripe]:
+            # Live windows are never evicted; idle and removed keys are freed by _trim_rate_limits on reload.
+            queue = self._rate_limits[stripe].setdefault(fingerprint, deque())
+            cutoff = now - _RATE_LIMIT_WINDOW_S
             while queue and queue[0] < cutoff:
                 queue.popleft()
             if len(queue) >= limit:
@@ -458,29 +666,39 @@ class PublicKeyAuthenticator:
             queue.append(now)
         return False
 
-    def _is_nonce_reused(self, nonce: str, now: datetime) -> bool:
-        with self._lock:
-            cutoff = now - _NONCE_TTL
-            expired = [key for key, ts in self._nonce_cache.items() if ts < cutoff]
-            for key in expired:
-                self._nonce_cache.pop(key, None)
-            if nonce in self._nonce_cache:
-                return True
-            self._nonce_cache[nonce] = now
-        return False
+    def _is_nonce_reused(self, nonce: str, now: float) -> bool:
+        with self._nonce_lock:
+            self._expire_nonces(now)
+            return nonce in self._nonce_cache
+
+    def _claim_nonce(self, nonce: str, now: float) -> Optional[str]:
+        """Record `nonce` as used; return an error reason if it cannot be claimed."""
+
+        with self._nonce_lock:
+            self._expire_nonces(now)
+            cache = self._nonce_cache
+            if nonce in cache:
+                return "invalid_sig"
+            # Fail closed under floods: evicting a live nonce would reopen its replay window.
+            if len(cache) >= self._max_nonce_entries:
+                return "rate_limited"
+            cache[nonce] = now
+        return None
+
+    def _expire_nonces(self, now: float) -> None:
+        # Entries are appended in time order, so expired nonces are always at the front.
+        cutoff = now - _NONCE_TTL_S
+        cache = self._nonce_cache
+        while cache:
+            oldest = next(iter(cache.values()))
+            if oldest >= cutoff:
+                break
+            cache.popitem(last=False)
 
     @staticmethod
-    def _verify_signature_with_key(key_obj: Any, signature: bytes, canonical_data: str) -> bool:
-        data = canonical_data.encode("utf-8")
+    def _verify_signature_with_key(authorized: AuthorizedKey, signature: bytes, canonical_bytes: bytes) -> bool:
         try:
-            if isinstance(key_obj, ed25519.Ed25519PublicKey):
-                key_obj.verify(signature, data)
-            elif isinstance(key_obj, rsa.RSAPublicKey):
-                key_obj.verify(signature, data, padding.PKCS1v15(), hashes.SHA256())
-            elif isinstance(key_obj, ec.EllipticCurvePublicKey):
-                key_obj.verify(signature, data, ec.ECDSA(hashes.SHA256()))
-            else:
-                return False
+            authorized.verify_fn(signature, canonical_bytes)
         except InvalidSignature:
             return False
         return True
@@ -496,6 +714,8 @@ def create_authenticator_from_env() -> PublicKeyAuthenticator:
         DES_VAULT_MOUNT: KV v2 mount point (default: "secret").
         DES_VAULT_PATH: Secret path (default: "des/authorized_keys").
         DES_AUTHORIZED_KEYS_PATH: YAML fallback path when Vault is not configured.
+        DES_AUTHORIZED_KEYS_RELOAD_INTERVAL: Optional background reload period in seconds (either backend).
+        DES_AUTH_MAX_NONCE_ENTRIES: Optional replay-cache ceiling (default 1,000,000); size as 600 x peak requests/s.
 
     Returns:
         Configured authenticator instance.
@@ -512,6 +732,10 @@ def create_authenticator_from_env() -> PublicKeyAuthenticator:
         >>> os.environ["DES_AUTHORIZED_KEYS_PATH"] = "/etc/des/authorized_keys.yaml"
         >>> authenticator = create_authenticator_from_env()
     """
+    interval_raw = os.environ.get("DES_AUTHORIZED_KEYS_RELOAD_INTERVAL")
+    reload_interval = float(interval_raw) if interval_raw else None
+    max_nonces_raw = os.environ.get("DES_AUTH_MAX_NONCE_ENTRIES")
+    max_nonce_entries = int(max_nonces_raw) if max_nonces_raw else None
     addr = os.environ.get("DES_VAULT_ADDR")
     if addr:
         token = os.environ.get("DES_VAULT_TOKEN") or None
@@ -521,10 +745,14 @@ def create_authenticator_from_env() -> PublicKeyAuthenticator:
         mount = os.environ.get("DES_VAULT_MOUNT", "secret")
         path = os.environ.get("DES_VAULT_PATH", "des/authorized_keys")
         client = OpenBaoClient(addr=addr, token=token, role=role, mount=mount, path=path)
-        return PublicKeyAuthenticator(None, openbao_client=client)
+        return PublicKeyAuthenticator(
+            None, openbao_client=client, reload_interval=reload_interval, max_nonce_entries=max_nonce_entries
+        )
 
     config_path = os.environ.get("DES_AUTHORIZED_KEYS_PATH")
     if config_path:
-        return PublicKeyAuthenticator(config_path)
+        return PublicKeyAuthenticator(
+            config_path, reload_interval=reload_interval, max_nonce_entries=max_nonce_entries
+        )
 
     raise ValueError("DES_VAULT_ADDR or DES_AUTHORIZED_KEYS_PATH must be set")
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from collections import OrderedDict
 from dataclasses import dataclass
-from threading import RLock
+from threading import Lock
 from typing import Generic, Hashable, TypeVar
 
 K = TypeVar("K", bound=Hashable)
@@ -33,22 +33,21 @@ class LRUCache(Cache[K, V]):
         cfg = config or LRUCacheConfig()
         self._max_size = cfg.max_size
         self._store: OrderedDict[K, V] = OrderedDict()
-        self._lock = RLock()
+        self._lock = Lock()
 
     def get(self, key: K) -> V | None:
         with self._lock:
             try:
-                value = self._store.pop(key)
+                value = self._store[key]
             except KeyError:
                 return None
-            self._store[key] = value
+            self._store.move_to_end(key)
             return value
 
     def set(self, key: K, value: V) -> None:
         with self._lock:
-            if key in self._store:
-                self._store.pop(key)
             self._store[key] = value
+            self._store.move_to_end(key)
             if len(self._store) > self._max_size:
                 self._store.popitem(last=False)
 
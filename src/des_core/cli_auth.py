@@ -7,7 +7,7 @@ import json
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, cast
 from urllib.error import HTTPError, URLError
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 from urllib.request import Request, urlopen
@@ -25,16 +25,35 @@ def _load_private_key(path: Path) -> Any:
         return serialization.load_ssh_private_key(data, password=None)
 
 
-def _sign_payload(private_key: Any, payload: bytes) -> bytes:
+def _build_signer(private_key: Any) -> Callable[[bytes], bytes]:
     if isinstance(private_key, ed25519.Ed25519PrivateKey):
-        return private_key.sign(payload)
+        return cast(Callable[[bytes], bytes], private_key.sign)
     if isinstance(private_key, rsa.RSAPrivateKey):
-        return private_key.sign(payload, padding.PKCS1v15(), hashes.SHA256())
+        rsa_key = private_key
+        rsa_padding = padding.PKCS1v15()
+        rsa_hash = hashes.SHA256()
+        return lambda payload: rsa_key.sign(payload, rsa_padding, rsa_hash)
     if isinstance(private_key, ec.EllipticCurvePrivateKey):
-        return private_key.sign(payload, ec.ECDSA(hashes.SHA256()))
+        ec_key = private_key
+        ecdsa = ec.ECDSA(hashes.SHA256())
+        return lambda payload: ec_key.sign(payload, ecdsa)
     raise ValueError("Unsupported private key type")
 
 
+def make_signer(path: Path) -> Callable[[bytes], bytes]:
+    """Load a private key once and return a callable that signs payloads for DES auth headers.
+
+    Intended for scripts and load generators that sign many requests: the key file is parsed and the
+    algorithm parameters are bound a single time.
+    """
+
+    return _build_signer(_load_private_key(path))
+
+
+def _sign_payload(private_key: Any, payload: bytes) -> bytes:
+    return _build_signer(private_key)(payload)
+
+
 def _append_created_at(url: str, created_at: str) -> str:
     parsed = urlparse(url)
     query = parse_qs(parsed.query)
@@ -69,7 +88,7 @@ def test(private_key: Path, url: str, created_at: str) -> None:
     timestamp = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
     nonce = str(uuid.uuid4())
     canonical = f"{uid}|{created_at}|{timestamp}|{nonce}".encode("utf-8")
-    signature = _sign_payload(key, canonical)
+    signature = _build_signer(key)(canonical)
 
     public_key = key.public_key().public_bytes(
         encoding=serialization.Encoding.OpenSSH,
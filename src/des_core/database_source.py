@@ -6,9 +6,10 @@ optional shard filter. It performs SELECT-only operations.
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, AsyncIterator, Iterable, Protocol
+from typing import Any, AsyncIterator, Callable, Protocol, TypeVar
 
 try:  # pragma: no cover - optional check
     import sqlite3
@@ -17,6 +18,18 @@ except Exception:  # pragma: no cover - defensive
 
 from .archive_config import ArchiveWindow
 
+_T = TypeVar("_T")
+
+# Deterministic, server-side uid hash per dialect; shard membership is MOD(hash, shards_total) = shard_id.
+_SHARD_HASH_SQL = {
+    "postgresql": "abs(hashtext(CAST({uid} AS text))::bigint)",
+    "mysql": "CONV(SUBSTR(MD5({uid}), 1, 8), 16, 10)",
+    "oracle": "ORA_HASH({uid})",
+}
+_DIALECTS = frozenset({"generic", *_SHARD_HASH_SQL})
+# Row-limit clause per dialect; Oracle has no LIMIT and uses the SQL:2008 form instead.
+_PAGE_LIMIT_SQL = {"oracle": "FETCH FIRST ? ROWS ONLY"}
+
 
 class SupportsSelect(Protocol):
     """Minimal DB-API surface for read-only access."""
@@ -37,6 +50,10 @@ class SourceDatabaseConfig:
     shards_total: int = 1
     shard_id: int = 0
     page_size: int = 1000
+    # Rows per driver round-trip; None sizes each fetch to the page being read, so one keyset page is one fetch.
+    prefetch_rows: int | None = None
+    # "generic" filters shards in Python; a named dialect pushes the shard predicate into SQL.
+    dialect: str = "generic"
 
 
 @dataclass(frozen=True)
@@ -53,41 +70,123 @@ class DatabaseSourceProvider:
         self._conn = conn
         self._cfg = config
         self._is_sqlite = sqlite3 is not None and isinstance(conn, sqlite3.Connection)
+        if config.dialect not in _DIALECTS:
+            raise ValueError(f"Unsupported dialect {config.dialect!r}; expected one of {sorted(_DIALECTS)}")
 
     async def iter_records_for_window(self, window: ArchiveWindow) -> AsyncIterator[SourceRecord]:
         """Yield SourceRecord rows in (window_start, window_end], ordered by (created_at, uid)."""
 
-        last_created_at: datetime | None = None
-        last_uid: str | None = None
+        async for batch in self.iter_batches_for_window(window):
+            for record in batch:
+                yield record
 
-        while True:
-            rows = self._fetch_page(window, last_created_at, last_uid)
-            if not rows:
-                break
+    async def iter_batches_for_window(
+        self,
+        window: ArchiveWindow,
+        page_size: int | Callable[[], int] | None = None,
+    ) -> AsyncIterator[list[SourceRecord]]:
+        """Yield one list of SourceRecord per keyset page (page_size defaults to the configured page size).
+
+        A callable page_size is re-evaluated before every page, letting the consumer resize pages mid-window.
+        Pages are double-buffered: the next page is requested before the current batch is yielded, so a callable
+        page_size takes effect one page later. A page shorter than its limit ends the window without another query.
+        Batches can be shorter than page_size when the Python shard filter drops rows; empty batches are skipped.
+        The Python filter only runs when no SQL shard predicate is available (the "generic" dialect).
+        """
+
+        shards_total = self._cfg.shards_total
+        shard_id = self._cfg.shard_id
+        python_shard_filter = shards_total > 1 and self._shard_filter_condition() is None
+
+        def next_limit() -> int:
+            return page_size() if callable(page_size) else (page_size or self._cfg.page_size)
+
+        limit = next_limit()
+        pending: asyncio.Task[list[tuple[Any, ...]]] | None = asyncio.create_task(
+            self._run(self._fetch_page, window, None, None, limit)
+        )
+        try:
+            while pending is not None:
+                rows = await pending
+                pending = None
+                if not rows:
+                    break
+
+                # Track the last row from the DB to drive keyset pagination even if we filter by shard in Python.
+                last_uid, last_created_at = rows[-1][0], rows[-1][1]
+                if len(rows) >= limit:
+                    limit = next_limit()
+                    pending = asyncio.create_task(self._run(self._fetch_page, window, last_created_at, last_uid, limit))
+
+                batch = [
+                    SourceRecord(
+                        uid=str(uid),
+                        created_at=_coerce_datetime(created_at),
+                        file_location=str(location),
+                    )
+                    for uid, created_at, location in rows
+                    if not python_shard_filter or hash(str(uid)) % shards_total == shard_id
+                ]
+                if batch:
+                    yield batch
+        finally:
+            if pending is not None:
+                # Cancelling would not stop a fetch already running in a worker thread; wait for it instead so the
+                # connection is idle again when the caller stops iterating early.
+                await asyncio.gather(pending, return_exceptions=True)
 
-            # Track the last row from the DB to drive keyset pagination even if we filter by shard in Python.
-            last_created_at = rows[-1][self._cfg.created_at_column]
-            last_uid = rows[-1][self._cfg.uid_column]
+    async def count_records_for_window(self, window: ArchiveWindow) -> int:
+        """Return how many records iter_records_for_window would yield, counted server-side when possible."""
+
+        shard_condition = self._shard_filter_condition()
+        if self._cfg.shards_total > 1 and shard_condition is None:
+            # Shard membership is only known in Python; fall back to walking the window.
+            count = 0
+            async for _ in self.iter_records_for_window(window):
+                count += 1
+            return count
+
+        conditions: list[str] = [
+            f"{self._cfg.created_at_column} > ?",
+            f"{self._cfg.created_at_column} <= ?",
+        ]
+        if shard_condition:
+            conditions.append(shard_condition)
+        sql = f"SELECT COUNT(*) FROM {self._cfg.table_name} WHERE {' AND '.join(conditions)}"
 
-            for row in rows:
-                if self._cfg.shards_total > 1:
-                    if hash(str(row[self._cfg.uid_column])) % self._cfg.shards_total != self._cfg.shard_id:
-                        continue
-                yield SourceRecord(
-                    uid=str(row[self._cfg.uid_column]),
-                    created_at=_coerce_datetime(row[self._cfg.created_at_column]),
-                    file_location=str(row[self._cfg.location_column]),
-                )
+        params = (self._normalize_param(window.window_start), self._normalize_param(window.window_end))
+        return await self._run(self._count, sql, params)
 
     # --- internal helpers ---
 
+    async def _run(self, func: Callable[..., _T], *args: Any) -> _T:
+        """Run a sync helper off the event loop; sqlite connections are bound to their thread, so run inline."""
+
+        if self._is_sqlite:
+            return func(*args)
+        return await asyncio.to_thread(func, *args)
+
+    def _count(self, sql: str, params: tuple[Any, ...]) -> int:
+        cursor = self._conn.cursor()
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+        return int(row[0]) if row else 0
+
     def _fetch_page(
         self,
         window: ArchiveWindow,
         last_created_at: datetime | None,
         last_uid: str | None,
-    ) -> list[dict[str, Any]]:
+        limit: int,
+    ) -> list[tuple[Any, ...]]:
+        """Return one page as positional (uid, created_at, location) rows, in SELECT order."""
+
         cursor = self._conn.cursor()
+        # DB-API arraysize drives fetchmany batching; drivers with a separate prefetch knob (oracledb) get it too.
+        prefetch_rows = self._cfg.prefetch_rows if self._cfg.prefetch_rows is not None else limit
+        cursor.arraysize = prefetch_rows
+        if hasattr(cursor, "prefetchrows"):
+            cursor.prefetchrows = prefetch_rows
 
         conditions: list[str] = [
             f"{self._cfg.created_at_column} > ?",
@@ -117,30 +216,28 @@ class DatabaseSourceProvider:
             f"FROM {self._cfg.table_name} "
             f"WHERE {' AND '.join(conditions)} "
             f"ORDER BY {self._cfg.created_at_column}, {self._cfg.uid_column} "
-            f"LIMIT ?"
+            f"{_PAGE_LIMIT_SQL.get(self._cfg.dialect, 'LIMIT ?')}"
         )
-        params.append(self._cfg.page_size)
+        params.append(limit)
 
         cursor.execute(sql, tuple(params))
-        rows = cursor.fetchall()
-        return self._rows_to_dicts(cursor, rows)
+        return cursor.fetchmany(limit)
 
     def _shard_filter_condition(self) -> str | None:
-        """Override to inject DB-specific shard predicate; Python fallback is always applied."""
+        """Return the SQL shard predicate for the configured dialect, or None to filter in Python.
+
+        Subclasses may override to supply an expression for other engines; whenever a predicate is returned the
+        Python fallback is skipped, so the database only ships this shard's rows.
+        """
 
         if self._cfg.shards_total <= 1:
             return None
-        # No portable SQL hash across engines; subclasses may override to add an engine-specific expression.
-        return None
-
-    @staticmethod
-    def _rows_to_dicts(cursor: Any, rows: Iterable[Iterable[Any]]) -> list[dict[str, Any]]:
-        columns = [col[0] for col in cursor.description]
-        result: list[dict[str, Any]] = []
-        for row in rows:
-            row_values = list(row)
-            result.append({col: row_values[idx] for idx, col in enumerate(columns)})
-        return result
+        hash_sql = _SHARD_HASH_SQL.get(self._cfg.dialect)
+        if hash_sql is None:
+            return None
+        # Both values are ints from config, so they are inlined rather than bound.
+        expr = hash_sql.format(uid=self._cfg.uid_column)
+        return f"MOD({expr}, {int(self._cfg.shards_total)}) = {int(self._cfg.shard_id)}"
 
     def _normalize_param(self, value: Any) -> Any:
         """Avoid deprecated sqlite datetime adapter on 3.12 by passing strings."""
@@ -161,5 +258,6 @@ def _coerce_datetime(value: Any) -> datetime:
 # Quick-start summary:
 # - SourceDatabaseConfig describes the external table/columns and optional sharding.
 # - DatabaseSourceProvider.iter_records_for_window(window) yields SourceRecord rows in (window_start, window_end],
-#   applying shard filtering in Python by default; override _shard_filter_condition for SQL-level hashing.
+#   applying shard filtering in SQL for a named `dialect` (postgresql/mysql/oracle) and in Python for "generic";
+#   override _shard_filter_condition to add SQL-level hashing for other engines.
 # - Pair with ArchiveConfigRepository.advance_cutoff/compute_window to drive daily packer runs.
@@ -6,7 +6,7 @@ import logging
 import time
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Callable, List, Mapping, Optional, Sequence, TypedDict, TypeVar, cast
+from typing import Any, Callable, Iterator, List, Mapping, Optional, Sequence, TypedDict, TypeVar, cast
 
 from sqlalchemy import (
     Boolean,
@@ -115,6 +115,26 @@ class SourceDatabase:
         rows = self._with_retry(lambda: self._execute(stmt))
         return [self._row_to_record(row) for row in rows]
 
+    def iter_files_to_archive(self, cutoff_date: datetime, yield_per: int = 1000) -> Iterator[SourceFileRecord]:
+        """Stream every file older than `cutoff_date` not marked as archived, ordered by created_at ascending.
+
+        Intended for full sweeps: rows are read through a server-side cursor in chunks of `yield_per`, so memory stays
+        bounded regardless of how many rows match. Unlike `fetch_files_to_archive`, errors raised after streaming has
+        started are not retried.
+        """
+
+        if self._archived_column is None:
+            raise ValueError("archived_column is not configured for SourceDatabase")
+        if yield_per <= 0:
+            raise ValueError("yield_per must be positive")
+        stmt = self._build_statement(cutoff_date, None, self._archived_column).execution_options(
+            stream_results=True, yield_per=yield_per
+        )
+        with self._engine.connect() as conn:
+            result = conn.execute(stmt)
+            for row in result.mappings():
+                yield self._row_to_record(row)
+
     def get_archive_statistics(self, cutoff_date: datetime) -> ArchiveStatistics:
         """Return aggregated statistics for files eligible for archiving.
 
@@ -1,15 +1,36 @@
 import sqlite3
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any
 
 import pytest
 
-from des_core.archive_config import ArchiveConfigRepository
+from des_core.archive_config import ArchiveConfigRepository, ArchiveWindow, floor_to_midnight
 
 
 def _make_conn() -> sqlite3.Connection:
     return sqlite3.connect(":memory:")
 
 
+class _DriverConn:
+    """Non-sqlite3 DB-API stand-in that adapts datetimes itself and records the executing threads."""
+
+    def __init__(self) -> None:
+        self._inner = sqlite3.connect(":memory:", check_same_thread=False)
+        self.threads: set[int] = set()
+
+    def execute(self, sql: str, params: Any | None = None) -> Any:
+        self.threads.add(threading.get_ident())
+        bound = tuple(p.isoformat() if isinstance(p, datetime) else p for p in params or ())
+        return self._inner.execute(sql, bound)
+
+    def cursor(self) -> Any:
+        return self._inner.cursor()
+
+    def commit(self) -> None:
+        self._inner.commit()
+
+
 @pytest.mark.asyncio
 async def test_ensure_initialized_creates_row() -> None:
     conn = _make_conn()
@@ -22,6 +43,9 @@ async def test_ensure_initialized_creates_row() -> None:
     assert archived_until == default_until
     assert lag_days == 7
 
+    await repo.ensure_initialized(default_archived_until=datetime(2025, 1, 1), default_lag_days=3)
+    assert await repo.get_config() == (default_until, 7)
+
 
 @pytest.mark.asyncio
 async def test_advance_cutoff_noop_when_target_not_ahead() -> None:
@@ -53,3 +77,54 @@ async def test_advance_cutoff_updates_when_target_moves_forward() -> None:
     archived_until, lag_days = await repo.get_config()
     assert archived_until == datetime(2024, 1, 7)
     assert lag_days == 3
+
+
+@pytest.mark.asyncio
+async def test_advance_with_cas_rejects_stale_watermark() -> None:
+    conn = _make_conn()
+    repo = ArchiveConfigRepository(conn)
+    await repo.ensure_initialized(default_archived_until=datetime(2024, 1, 1), default_lag_days=3)
+
+    assert await repo.advance_with_cas(datetime(2024, 1, 1), datetime(2024, 1, 7)) is True
+    assert await repo.advance_with_cas(datetime(2024, 1, 1), datetime(2024, 1, 9)) is False
+
+    archived_until, _ = await repo.get_config()
+    assert archived_until == datetime(2024, 1, 7)
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cas_matches_differently_formatted_timestamp() -> None:
+    conn = _make_conn()
+    repo = ArchiveConfigRepository(conn)
+    await repo.ensure_initialized(default_archived_until=datetime(2024, 1, 1), default_lag_days=3)
+    # Rows written by other tools may use sqlite's own "YYYY-MM-DD HH:MM:SS" spelling.
+    conn.execute("UPDATE des_archive_config SET archived_until = '2024-01-01 00:00:00' WHERE id = 1")
+    conn.commit()
+
+    assert await repo.advance_with_cas(datetime(2024, 1, 1), datetime(2024, 1, 7)) is True
+    assert await repo.advance_cutoff(datetime(2024, 1, 12)) == ArchiveWindow(
+        window_start=datetime(2024, 1, 7), window_end=datetime(2024, 1, 9), lag_days=3
+    )
+
+
+def test_target_cutoff_matches_floor_of_lagged_now() -> None:
+    tz = timezone(timedelta(hours=2))
+    for now in (datetime(2024, 3, 1, 0, 30), datetime(2024, 3, 1, 23, 59, 59, 999999, tzinfo=tz)):
+        for lag_days in (0, 1, 7, 40):
+            expected = floor_to_midnight(now - timedelta(days=lag_days))
+            cutoff = ArchiveConfigRepository._compute_target_cutoff(now, lag_days)
+            assert cutoff == expected
+            assert cutoff.tzinfo is now.tzinfo
+
+
+@pytest.mark.asyncio
+async def test_non_sqlite_connection_runs_off_the_event_loop() -> None:
+    conn = _DriverConn()
+    repo = ArchiveConfigRepository(conn)
+    await repo.ensure_initialized(default_archived_until=datetime(2024, 1, 1), default_lag_days=3)
+
+    window = await repo.advance_cutoff(datetime(2024, 1, 10))
+
+    assert (window.window_start, window.window_end) == (datetime(2024, 1, 1), datetime(2024, 1, 7))
+    assert await repo.get_config() == (datetime(2024, 1, 7), 3)
+    assert conn.threads and threading.get_ident() not in conn.threads
@@ -1,9 +1,11 @@
 import base64
 from datetime import datetime, timedelta, timezone
 
+import pytest
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import ed25519, padding, rsa
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, padding, rsa
 
+from des_core import auth as auth_module
 from des_core.auth import PublicKeyAuthenticator
 
 
@@ -187,6 +189,30 @@ def test_verify_signature_valid_rsa() -> None:
     assert error is None
 
 
+def test_verify_signature_accepts_canonical_bytes() -> None:
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    public_key = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.OpenSSH,
+        format=serialization.PublicFormat.OpenSSH,
+    ).decode("utf-8")
+    auth = PublicKeyAuthenticator(None, config_data=_build_config(public_key), clock=lambda: now)
+
+    timestamp = now.isoformat().replace("+00:00", "Z")
+    canonical = f"uid-1|2024-01-01T00:00:00Z|{timestamp}|nonce-bytes"
+    is_valid, key, error = auth.verify_signature(
+        public_key_b64=_encode_public_key(public_key),
+        signature_b64=_sign_ed25519(private_key, canonical),
+        canonical_data=canonical.encode("utf-8"),
+        timestamp=timestamp,
+        nonce="nonce-bytes",
+    )
+
+    assert is_valid is True
+    assert key is not None
+    assert error is None
+
+
 def test_check_permission_with_prefixes() -> None:
     now = datetime(2024, 1, 1, tzinfo=timezone.utc)
     private_key = ed25519.Ed25519PrivateKey.generate()
@@ -207,3 +233,270 @@ def test_check_permission_with_prefixes() -> None:
     assert auth.check_permission(authorized, "read", "finance/report") is True
     assert auth.check_permission(authorized, "read", "legal/report") is False
     assert auth.check_permission(authorized, "read", "finance/pii/record") is False
+
+
+def test_verify_signature_canonical_key_skips_parse_and_commented_key_is_cached() -> None:
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    public_key = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.OpenSSH,
+        format=serialization.PublicFormat.OpenSSH,
+    ).decode("utf-8")
+
+    config = _build_config(public_key)
+    auth = PublicKeyAuthenticator(None, config_data=config, clock=lambda: now)
+    timestamp = now.isoformat().replace("+00:00", "Z")
+    cache = auth_module._load_and_normalize
+    misses_before = cache.cache_info().misses
+    hits_before = cache.cache_info().hits
+
+    sent_keys = [public_key, f"{public_key} laptop", f"{public_key} laptop"]
+    for index, sent_key in enumerate(sent_keys):
+        nonce = f"nonce-cache-{index}"
+        canonical = f"uid-1|2024-01-01T00:00:00Z|{timestamp}|{nonce}"
+        is_valid, key, error = auth.verify_signature(
+            public_key_b64=_encode_public_key(sent_key),
+            signature_b64=_sign_ed25519(private_key, canonical),
+            canonical_data=canonical,
+            timestamp=timestamp,
+            nonce=nonce,
+        )
+        assert is_valid is True
+        assert key is not None
+        assert error is None
+
+    assert cache.cache_info().misses == misses_before + 1
+    assert cache.cache_info().hits == hits_before + 1
+
+
+def test_nonce_cache_expires_oldest_entries_only() -> None:
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    public_key = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.OpenSSH,
+        format=serialization.PublicFormat.OpenSSH,
+    ).decode("utf-8")
+    auth = PublicKeyAuthenticator(None, config_data=_build_config(public_key), clock=lambda: now)
+
+    assert auth._claim_nonce("a", 1000.0) is None
+    assert auth._claim_nonce("b", 1360.0) is None
+    assert auth._is_nonce_reused("a", 1300.0) is True
+    assert auth._claim_nonce("a", 1300.0) == "invalid_sig"
+    assert auth._is_nonce_reused("a", 1660.0) is False
+    assert auth._claim_nonce("a", 1660.0) is None
+    assert list(auth._nonce_cache) == ["b", "a"]
+
+
+def test_nonce_cache_fails_closed_when_full() -> None:
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    public_key = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.OpenSSH,
+        format=serialization.PublicFormat.OpenSSH,
+    ).decode("utf-8")
+    auth = PublicKeyAuthenticator(None, config_data=_build_config(public_key), max_nonce_entries=2)
+
+    assert auth._claim_nonce("a", 1000.0) is None
+    assert auth._claim_nonce("b", 1001.0) is None
+    assert auth._claim_nonce("c", 1002.0) == "rate_limited"
+    assert list(auth._nonce_cache) == ["a", "b"]
+
+
+def test_invalid_signature_does_not_consume_nonce() -> None:
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    public_key = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.OpenSSH,
+        format=serialization.PublicFormat.OpenSSH,
+    ).decode("utf-8")
+    auth = PublicKeyAuthenticator(None, config_data=_build_config(public_key), clock=lambda: now)
+
+    timestamp = now.isoformat().replace("+00:00", "Z")
+    canonical = f"uid-1|2024-01-01T00:00:00Z|{timestamp}|nonce-x"
+    forged = _sign_ed25519(ed25519.Ed25519PrivateKey.generate(), canonical)
+    genuine = _sign_ed25519(private_key, canonical)
+
+    results = [
+        auth.verify_signature(
+            public_key_b64=_encode_public_key(public_key),
+            signature_b64=signature,
+            canonical_data=canonical,
+            timestamp=timestamp,
+            nonce="nonce-x",
+        )
+        for signature in (forged, genuine, genuine)
+    ]
+
+    assert [result[0] for result in results] == [False, True, False]
+    assert results[2][2] == "invalid_sig"
+
+
+def test_full_nonce_cache_is_counted_apart_from_rate_limits() -> None:
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    public_key = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.OpenSSH,
+        format=serialization.PublicFormat.OpenSSH,
+    ).decode("utf-8")
+    auth = PublicKeyAuthenticator(None, config_data=_build_config(public_key), clock=lambda: now, max_nonce_entries=1)
+    timestamp = now.isoformat().replace("+00:00", "Z")
+    full_metric = auth_module._M_NONCE_CACHE_FULL
+    full_before = full_metric._value.get()
+    rate_limited_before = auth_module._M_RATE_LIMITED._value.get()
+
+    results = []
+    for nonce in ("nonce-a", "nonce-b"):
+        canonical = f"uid-1|2024-01-01T00:00:00Z|{timestamp}|{nonce}"
+        results.append(
+            auth.verify_signature(
+                public_key_b64=_encode_public_key(public_key),
+                signature_b64=_sign_ed25519(private_key, canonical),
+                canonical_data=canonical,
+                timestamp=timestamp,
+                nonce=nonce,
+            )
+        )
+
+    assert [(result[0], result[2]) for result in results] == [(True, None), (False, "rate_limited")]
+    assert full_metric._value.get() == full_before + 1
+    assert auth_module._M_RATE_LIMITED._value.get() == rate_limited_before
+
+
+def test_max_nonce_entries_must_be_positive() -> None:
+    with pytest.raises(ValueError, match="max_nonce_entries"):
+        PublicKeyAuthenticator(None, config_data={"authorized_keys": []}, max_nonce_entries=0)
+
+
+def test_reload_frees_idle_and_removed_rate_limit_windows() -> None:
+    limited, removed = (
+        ed25519.Ed25519PrivateKey.generate().public_key().public_bytes(
+            encoding=serialization.Encoding.OpenSSH,
+            format=serialization.PublicFormat.OpenSSH,
+        ).decode("utf-8")
+        for _ in range(2)
+    )
+    config = {
+        "authorized_keys": [
+            {"public_key": limited, "permissions": ["read"], "max_requests_per_hour": 5},
+            {"public_key": removed, "permissions": ["read"], "max_requests_per_hour": 5},
+        ]
+    }
+    auth = PublicKeyAuthenticator(None, config_data=config)
+    auth._mono = lambda: 1000.0
+    limited_fp, removed_fp = (entry.fingerprint for entry in auth._authorized_keys.values())
+    assert auth._is_rate_limited(limited_fp, 1000.0, 5) is False
+    assert auth._is_rate_limited(removed_fp, 1000.0, 5) is False
+
+    auth._config_data = {"authorized_keys": config["authorized_keys"][:1]}
+    auth.reload()
+    windows = [fp for stripe in auth._rate_limits for fp in stripe]
+    assert windows == [limited_fp]
+
+    # Once every request in a window has aged out, the next reload frees it even if the config is unchanged.
+    auth._mono = lambda: 1000.0 + 3601.0
+    auth.reload()
+    assert all(not stripe for stripe in auth._rate_limits)
+
+
+def test_unsupported_key_type_is_rejected_at_load() -> None:
+    with pytest.raises(ValueError, match="Unsupported public_key type"):
+        auth_module._build_verifier(object())
+
+
+def test_verify_signature_rejects_timestamp_outside_skew() -> None:
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    public_key = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.OpenSSH,
+        format=serialization.PublicFormat.OpenSSH,
+    ).decode("utf-8")
+    auth = PublicKeyAuthenticator(None, config_data=_build_config(public_key), clock=lambda: now)
+
+    results = []
+    for index, offset in enumerate((timedelta(minutes=-6), timedelta(minutes=4, seconds=59), timedelta(minutes=6))):
+        timestamp = (now + offset).isoformat().replace("+00:00", "Z")
+        nonce = f"nonce-skew-{index}"
+        canonical = f"uid-1|2024-01-01T00:00:00Z|{timestamp}|{nonce}"
+        is_valid, _, _ = auth.verify_signature(
+            public_key_b64=_encode_public_key(public_key),
+            signature_b64=_sign_ed25519(private_key, canonical),
+            canonical_data=canonical,
+            timestamp=timestamp,
+            nonce=nonce,
+        )
+        results.append(is_valid)
+
+    assert results == [False, True, False]
+
+
+def test_verify_signature_rejects_malformed_base64() -> None:
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    public_key = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.OpenSSH,
+        format=serialization.PublicFormat.OpenSSH,
+    ).decode("utf-8")
+    auth = PublicKeyAuthenticator(None, config_data=_build_config(public_key), clock=lambda: now)
+    timestamp = now.isoformat().replace("+00:00", "Z")
+    canonical = f"uid-1|2024-01-01T00:00:00Z|{timestamp}|nonce-b64"
+    signature_b64 = _sign_ed25519(private_key, canonical)
+
+    for public_key_b64, sig_b64 in (
+        (_encode_public_key(public_key), signature_b64.rstrip("=")),
+        (_encode_public_key(public_key), f" {signature_b64}"),
+        (_encode_public_key(public_key) + "\n", signature_b64),
+        ("znak-é", signature_b64),
+    ):
+        is_valid, key, error = auth.verify_signature(
+            public_key_b64=public_key_b64,
+            signature_b64=sig_b64,
+            canonical_data=canonical,
+            timestamp=timestamp,
+            nonce="nonce-b64",
+        )
+        assert (is_valid, key, error) == (False, None, "invalid_sig")
+
+
+def test_unknown_key_type_rejected_before_parse(monkeypatch: pytest.MonkeyPatch) -> None:
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    public_key = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.OpenSSH,
+        format=serialization.PublicFormat.OpenSSH,
+    ).decode("utf-8")
+    auth = PublicKeyAuthenticator(None, config_data=_build_config(public_key))
+
+    def _fail(*_: object) -> None:
+        raise AssertionError("key should not be parsed")
+
+    monkeypatch.setattr(auth_module.serialization, "load_ssh_public_key", _fail)
+    is_valid, key, error = auth.verify_signature(
+        public_key_b64=_encode_public_key("ssh-dss AAAAB3NzaC1kc3M"),
+        signature_b64=base64.b64encode(b"sig").decode("ascii"),
+        canonical_data="uid-1",
+        timestamp="2024-01-01T00:00:00Z",
+        nonce="nonce-type",
+    )
+
+    assert (is_valid, key, error) == (False, None, "invalid_sig")
+
+
+def test_verify_signature_valid_ecdsa_reuses_bound_verifier() -> None:
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    public_key = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.OpenSSH,
+        format=serialization.PublicFormat.OpenSSH,
+    ).decode("utf-8")
+    auth = PublicKeyAuthenticator(None, config_data=_build_config(public_key), clock=lambda: now)
+    timestamp = now.isoformat().replace("+00:00", "Z")
+
+    for nonce in ("nonce-ec-1", "nonce-ec-2"):
+        canonical = f"uid-1|2024-01-01T00:00:00Z|{timestamp}|{nonce}"
+        signature = private_key.sign(canonical.encode("utf-8"), ec.ECDSA(hashes.SHA256()))
+        is_valid, _, error = auth.verify_signature(
+            public_key_b64=_encode_public_key(public_key),
+            signature_b64=base64.b64encode(signature).decode("ascii"),
+            canonical_data=canonical,
+            timestamp=timestamp,
+            nonce=nonce,
+        )
+        assert (is_valid, error) == (True, None)
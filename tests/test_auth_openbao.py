@@ -1,7 +1,13 @@
+import os
+import signal
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
 from unittest.mock import Mock
 
 import pytest
+import requests
 import yaml
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import ed25519
@@ -31,6 +37,7 @@ def _mock_session(monkeypatch: pytest.MonkeyPatch, payload: dict[str, object]) -
     session = Mock()
     session.request.return_value = response
     monkeypatch.setattr(auth_module.requests, "Session", lambda: session)
+    auth_module._session_for.cache_clear()
     return session
 
 
@@ -89,9 +96,72 @@ def test_create_authenticator_from_env_yaml(monkeypatch: pytest.MonkeyPatch, tmp
     monkeypatch.delenv("DES_VAULT_TOKEN", raising=False)
     monkeypatch.delenv("DES_VAULT_ROLE", raising=False)
 
+    monkeypatch.setenv("DES_AUTH_MAX_NONCE_ENTRIES", "5000")
+
     authenticator = create_authenticator_from_env()
 
     assert len(authenticator._authorized_keys) == 1
+    assert authenticator._max_nonce_entries == 5000
+
+
+def test_yaml_reload_skips_unchanged_file(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    config_path = tmp_path / "authorized_keys.yaml"
+    config_path.write_text(yaml.safe_dump(_build_config(_generate_public_key())), encoding="utf-8")
+    authenticator = PublicKeyAuthenticator(config_path)
+    load_calls = Mock(wraps=yaml.load)
+    monkeypatch.setattr(auth_module.yaml, "load", load_calls)
+
+    authenticator.reload()
+    assert load_calls.call_count == 0
+
+    two_keys = {
+        "authorized_keys": [
+            {"public_key": _generate_public_key(), "permissions": ["read"]},
+            {"public_key": _generate_public_key(), "permissions": ["read"]},
+        ]
+    }
+    config_path.write_text(yaml.safe_dump(two_keys), encoding="utf-8")
+    authenticator.reload()
+
+    assert load_calls.call_count == 1
+    assert len(authenticator._authorized_keys) == 2
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="SIGHUP not available")
+def test_sighup_reloads_on_background_thread(tmp_path: Path) -> None:
+    config_path = tmp_path / "authorized_keys.yaml"
+    config_path.write_text(yaml.safe_dump(_build_config(_generate_public_key())), encoding="utf-8")
+    authenticator = PublicKeyAuthenticator(config_path)
+    previous_handler = signal.getsignal(signal.SIGHUP)
+    try:
+        authenticator.install_signal_handler()
+        config_path.write_text(yaml.safe_dump({"authorized_keys": []}), encoding="utf-8")
+        os.kill(os.getpid(), signal.SIGHUP)
+
+        deadline = time.monotonic() + 5
+        while authenticator._authorized_keys and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        signal.signal(signal.SIGHUP, previous_handler)
+        authenticator.close()
+
+    assert authenticator._authorized_keys == {}
+
+
+def test_reload_interval_picks_up_changes_in_background(tmp_path: Path) -> None:
+    config_path = tmp_path / "authorized_keys.yaml"
+    config_path.write_text(yaml.safe_dump(_build_config(_generate_public_key())), encoding="utf-8")
+    with PublicKeyAuthenticator(config_path, reload_interval=0.01) as authenticator:
+        config_path.write_text(yaml.safe_dump({"authorized_keys": []}), encoding="utf-8")
+        deadline = time.monotonic() + 5
+        while authenticator._authorized_keys and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert authenticator._authorized_keys == {}
+        reloader = authenticator._reload_thread
+
+    assert reloader is not None
+    assert not reloader.is_alive()
 
 
 def test_create_authenticator_from_env_missing(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -114,3 +184,44 @@ def test_public_key_authenticator_openbao_client() -> None:
 
     openbao_client.get_authorized_keys.assert_called_once()
     assert len(authenticator._authorized_keys) == 1
+
+
+def test_openbao_clients_share_session_per_addr() -> None:
+    auth_module._session_for.cache_clear()
+    first = auth_module.OpenBaoClient(addr="http://vault/", token="token")
+    second = auth_module.OpenBaoClient(addr="http://vault", token="token")
+    other = auth_module.OpenBaoClient(addr="http://other-vault", token="token")
+
+    assert first._session is second._session
+    assert first._session is not other._session
+    auth_module._session_for.cache_clear()
+
+
+def test_openbao_persistent_503_raises_http_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[str] = []
+
+    class _UnavailableHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            calls.append(self.path)
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *_: object) -> None:
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), _UnavailableHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(auth_module, "_OPENBAO_BACKOFF_FACTOR", 0)
+    auth_module._session_for.cache_clear()
+    try:
+        client = auth_module.OpenBaoClient(addr=f"http://127.0.0.1:{server.server_port}", token="token")
+        with pytest.raises(requests.HTTPError):
+            client.get_authorized_keys()
+    finally:
+        server.shutdown()
+        server.server_close()
+        auth_module._session_for.cache_clear()
+
+    assert len(calls) == auth_module._OPENBAO_RETRIES + 1
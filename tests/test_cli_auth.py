@@ -59,6 +59,25 @@ def test_sign_payload_rejects_unknown_key() -> None:
         cli_auth._sign_payload(object(), b"payload")
 
 
+def test_make_signer_loads_key_once(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    key_path = tmp_path / "key.pem"
+    _write_private_key(key_path, key)
+    loads: list[Path] = []
+    real_load = cli_auth._load_private_key
+
+    def counting_load(path: Path) -> object:
+        loads.append(path)
+        return real_load(path)
+
+    monkeypatch.setattr(cli_auth, "_load_private_key", counting_load)
+    sign = cli_auth.make_signer(key_path)
+
+    for payload in (b"one", b"two"):
+        key.public_key().verify(sign(payload), payload, padding.PKCS1v15(), hashes.SHA256())
+    assert loads == [key_path]
+
+
 def test_append_created_at() -> None:
     url = "https://example.com/files/uid-1"
     updated = cli_auth._append_created_at(url, "2024-01-01T00:00:00Z")
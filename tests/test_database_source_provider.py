@@ -1,6 +1,7 @@
 import sqlite3
+import threading
 from datetime import datetime
-from typing import Iterable
+from typing import Any, Iterable
 
 import pytest
 
@@ -8,8 +9,8 @@ from des_core.archive_config import ArchiveWindow
 from des_core.database_source import DatabaseSourceProvider, SourceDatabaseConfig, SourceRecord
 
 
-def _make_conn() -> sqlite3.Connection:
-    conn = sqlite3.connect(":memory:")
+def _make_conn(check_same_thread: bool = True) -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:", check_same_thread=check_same_thread)
     conn.execute(
         """
         CREATE TABLE big_files (
@@ -99,3 +100,213 @@ async def test_keyset_pagination_no_duplicates_or_gaps() -> None:
 
     records = await _collect(provider, window)
     assert [r.uid for r in records] == ["u1", "u2", "u3", "u4"]
+
+
+@pytest.mark.asyncio
+async def test_count_records_matches_iteration() -> None:
+    conn = _make_conn()
+    _insert_rows(
+        conn,
+        [
+            ("a", datetime(2023, 12, 31, 23, 0, 0), "/old"),
+            ("b", datetime(2024, 1, 2, 10, 0, 0), "/in-1"),
+            ("c", datetime(2024, 1, 5, 12, 0, 0), "/in-2"),
+            ("d", datetime(2024, 1, 7, 9, 0, 0), "/after"),
+        ],
+    )
+    window = ArchiveWindow(window_start=datetime(2024, 1, 1), window_end=datetime(2024, 1, 6), lag_days=7)
+
+    provider = DatabaseSourceProvider(conn, SourceDatabaseConfig(dsn=":memory:", table_name="big_files"))
+    assert await provider.count_records_for_window(window) == 2
+
+    sharded = [
+        DatabaseSourceProvider(
+            conn, SourceDatabaseConfig(dsn=":memory:", table_name="big_files", shards_total=2, shard_id=shard)
+        )
+        for shard in (0, 1)
+    ]
+    counts = [await p.count_records_for_window(window) for p in sharded]
+    assert counts == [len(await _collect(p, window)) for p in sharded]
+    assert sum(counts) == 2
+
+
+@pytest.mark.asyncio
+async def test_iter_batches_yields_pages_of_page_size() -> None:
+    conn = _make_conn()
+    _insert_rows(conn, [(f"u{i}", datetime(2024, 1, 2, i), f"/f{i}") for i in range(5)])
+    window = ArchiveWindow(window_start=datetime(2024, 1, 1), window_end=datetime(2024, 1, 4), lag_days=7)
+
+    provider = DatabaseSourceProvider(conn, SourceDatabaseConfig(dsn=":memory:", table_name="big_files", page_size=2))
+    batches = [[r.uid for r in batch] async for batch in provider.iter_batches_for_window(window)]
+    assert batches == [["u0", "u1"], ["u2", "u3"], ["u4"]]
+
+    batches = [len(batch) async for batch in provider.iter_batches_for_window(window, page_size=4)]
+    assert batches == [4, 1]
+
+    sizes = iter([1, 3, 3, 3])
+    batches = [len(batch) async for batch in provider.iter_batches_for_window(window, page_size=lambda: next(sizes))]
+    assert batches == [1, 3, 1]
+
+
+class _ParityShardProvider(DatabaseSourceProvider):
+    """Stand-in for an engine-specific predicate that sqlite can evaluate."""
+
+    def _shard_filter_condition(self) -> str | None:
+        return f"CAST(substr(uid, 2) AS INTEGER) % {self._cfg.shards_total} = {self._cfg.shard_id}"
+
+
+@pytest.mark.asyncio
+async def test_sql_shard_predicate_replaces_python_filter() -> None:
+    conn = _make_conn()
+    _insert_rows(conn, [(f"u{i}", datetime(2024, 1, 2, i), f"/f{i}") for i in range(6)])
+    window = ArchiveWindow(window_start=datetime(2024, 1, 1), window_end=datetime(2024, 1, 4), lag_days=7)
+
+    shards = [
+        _ParityShardProvider(
+            conn, SourceDatabaseConfig(dsn=":memory:", table_name="big_files", shards_total=2, shard_id=shard)
+        )
+        for shard in (0, 1)
+    ]
+
+    assert [r.uid for r in await _collect(shards[0], window)] == ["u0", "u2", "u4"]
+    assert [r.uid for r in await _collect(shards[1], window)] == ["u1", "u3", "u5"]
+    assert await shards[1].count_records_for_window(window) == 3
+
+
+def test_dialect_shard_predicate() -> None:
+    conn = _make_conn()
+    cfg = SourceDatabaseConfig(dsn="", table_name="big_files", shards_total=4, shard_id=3, dialect="postgresql")
+    condition = DatabaseSourceProvider(conn, cfg)._shard_filter_condition()
+    assert condition == "MOD(abs(hashtext(CAST(uid AS text))::bigint), 4) = 3"
+
+    generic = SourceDatabaseConfig(dsn="", table_name="big_files", shards_total=4, shard_id=3)
+    assert DatabaseSourceProvider(conn, generic)._shard_filter_condition() is None
+
+    with pytest.raises(ValueError):
+        DatabaseSourceProvider(conn, SourceDatabaseConfig(dsn="", table_name="big_files", dialect="db2"))
+
+
+class _StatementConn:
+    """Non-sqlite connection that only records the SQL it is asked to run."""
+
+    def __init__(self, statements: list[str]) -> None:
+        self._statements = statements
+
+    def cursor(self) -> "_StatementCursor":
+        return _StatementCursor(self._statements)
+
+
+class _StatementCursor:
+    def __init__(self, statements: list[str]) -> None:
+        self.arraysize = 1
+        self._statements = statements
+
+    def execute(self, sql: str, params: Any = None) -> None:
+        self._statements.append(sql)
+
+    def fetchmany(self, size: int) -> list[tuple[Any, ...]]:
+        return []
+
+
+@pytest.mark.parametrize(
+    ("dialect", "limit_clause"),
+    [("generic", "LIMIT ?"), ("postgresql", "LIMIT ?"), ("oracle", "FETCH FIRST ? ROWS ONLY")],
+)
+def test_page_limit_clause_follows_dialect(dialect: str, limit_clause: str) -> None:
+    statements: list[str] = []
+    conn = _StatementConn(statements)
+    cfg = SourceDatabaseConfig(dsn="", table_name="big_files", dialect=dialect)
+    window = ArchiveWindow(window_start=datetime(2024, 1, 1), window_end=datetime(2024, 1, 4), lag_days=7)
+
+    assert DatabaseSourceProvider(conn, cfg)._fetch_page(window, None, None, 10) == []
+
+    assert statements[0].endswith(f"ORDER BY created_at, uid {limit_clause}")
+
+
+class _RecordingConn:
+    """Wraps a sqlite connection like a thread-safe driver and records cursor knobs and calling threads."""
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self._conn = conn
+        self.arraysizes: list[int] = []
+        self.threads: list[int] = []
+
+    def cursor(self) -> "_RecordingCursor":
+        self.threads.append(threading.get_ident())
+        return _RecordingCursor(self._conn.cursor(), self.arraysizes)
+
+    def commit(self) -> None:
+        self._conn.commit()
+
+
+class _RecordingCursor:
+    def __init__(self, cursor: sqlite3.Cursor, arraysizes: list[int]) -> None:
+        self._cursor = cursor
+        self._arraysizes = arraysizes
+
+    def __setattr__(self, name: str, value: object) -> None:
+        if name == "arraysize":
+            self._arraysizes.append(value)  # type: ignore[arg-type]
+        object.__setattr__(self, name, value)
+
+    def __getattr__(self, name: str) -> object:
+        return getattr(self._cursor, name)
+
+
+@pytest.mark.asyncio
+async def test_fetch_page_sets_prefetch_rows_and_runs_off_the_event_loop() -> None:
+    conn = _make_conn(check_same_thread=False)
+    _insert_rows(conn, [(f"u{i}", datetime(2024, 1, 2, i), f"/f{i}") for i in range(3)])
+    window = ArchiveWindow(window_start=datetime(2024, 1, 1), window_end=datetime(2024, 1, 4), lag_days=7)
+    recording = _RecordingConn(conn)
+    cfg = SourceDatabaseConfig(dsn=":memory:", table_name="big_files", page_size=2, prefetch_rows=500)
+
+    records = await _collect(DatabaseSourceProvider(recording, cfg), window)
+
+    assert [r.uid for r in records] == ["u0", "u1", "u2"]
+    # The short second page ends the window without a third query.
+    assert recording.arraysizes == [500, 500]
+    assert threading.get_ident() not in recording.threads
+
+
+@pytest.mark.asyncio
+async def test_prefetch_rows_defaults_to_page_size() -> None:
+    conn = _make_conn(check_same_thread=False)
+    _insert_rows(conn, [(f"u{i}", datetime(2024, 1, 2, i), f"/f{i}") for i in range(3)])
+    window = ArchiveWindow(window_start=datetime(2024, 1, 1), window_end=datetime(2024, 1, 4), lag_days=7)
+    recording = _RecordingConn(conn)
+    cfg = SourceDatabaseConfig(dsn=":memory:", table_name="big_files", page_size=10000)
+
+    records = await _collect(DatabaseSourceProvider(recording, cfg), window)
+
+    assert len(records) == 3
+    assert recording.arraysizes == [10000]
+
+
+@pytest.mark.asyncio
+async def test_count_records_runs_off_the_event_loop() -> None:
+    conn = _make_conn(check_same_thread=False)
+    _insert_rows(conn, [(f"u{i}", datetime(2024, 1, 2, i), f"/f{i}") for i in range(3)])
+    window = ArchiveWindow(window_start=datetime(2024, 1, 1), window_end=datetime(2024, 1, 4), lag_days=7)
+    recording = _RecordingConn(conn)
+    cfg = SourceDatabaseConfig(dsn=":memory:", table_name="big_files")
+
+    assert await DatabaseSourceProvider(recording, cfg).count_records_for_window(window) == 3
+    assert recording.threads and threading.get_ident() not in recording.threads
+
+
+@pytest.mark.asyncio
+async def test_closing_iteration_early_drains_prefetched_page() -> None:
+    conn = _make_conn(check_same_thread=False)
+    _insert_rows(conn, [(f"u{i}", datetime(2024, 1, 2, i), f"/f{i}") for i in range(6)])
+    window = ArchiveWindow(window_start=datetime(2024, 1, 1), window_end=datetime(2024, 1, 4), lag_days=7)
+    recording = _RecordingConn(conn)
+    provider = DatabaseSourceProvider(recording, SourceDatabaseConfig(dsn="", table_name="big_files", page_size=2))
+
+    batches = provider.iter_batches_for_window(window)
+    first = await batches.__anext__()
+    await batches.aclose()
+
+    assert [r.uid for r in first] == ["u0", "u1"]
+    # The second page was already requested while the first was being consumed.
+    assert len(recording.threads) == 2
@@ -89,6 +89,17 @@ def test_limit_applies(tmp_path: Path):
     assert records[0].uid == "old-keep"
 
 
+def test_iter_files_streams_all_matching_rows(tmp_path: Path):
+    engine = _setup_sqlite_db(tmp_path, include_size=True)
+    cutoff = datetime.now(timezone.utc) + timedelta(days=1)
+    db = SourceDatabase(db_url=str(engine.url), table_name="files")
+
+    records = list(db.iter_files_to_archive(cutoff_date=cutoff, yield_per=1))
+
+    assert [r.uid for r in records] == ["old-keep", "new"]
+    assert all(isinstance(r, SourceFileRecord) for r in records)
+
+
 def test_size_bytes_optional(tmp_path: Path):
     engine = _setup_sqlite_db(tmp_path, include_size=False)
     cutoff = datetime.now(timezone.utc) + timedelta(days=1)
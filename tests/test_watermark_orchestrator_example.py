@@ -0,0 +1,50 @@
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from des_core.database_source import SourceRecord
+from des_core.s3_file_reader import LocalFileReader
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "examples"))
+
+import watermark_orchestrator  # noqa: E402
+from watermark_orchestrator import WatermarkMigrationOrchestrator  # noqa: E402
+
+
+def _record(location: Path) -> SourceRecord:
+    return SourceRecord(uid=location.name, created_at=datetime(2024, 1, 1, tzinfo=timezone.utc), file_location=str(location))
+
+
+@pytest.mark.asyncio
+async def test_small_batch_in_large_directory_stats_only_its_files(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for i in range(2000):
+        (tmp_path / f"{i}.dat").write_bytes(b"x")
+    (tmp_path / "subdir.dat").mkdir()
+    orchestrator = object.__new__(WatermarkMigrationOrchestrator)
+    orchestrator._file_reader = LocalFileReader()
+
+    stat_calls: list[str] = []
+    real_stat = os.stat
+
+    def _counting_stat(path, *args, **kwargs):  # type: ignore[no-untyped-def]
+        stat_calls.append(str(path))
+        return real_stat(path, *args, **kwargs)
+
+    def _no_scandir(*_: object) -> None:
+        raise AssertionError("validation must not list the source directory")
+
+    monkeypatch.setattr(watermark_orchestrator.os, "stat", _counting_stat)
+    monkeypatch.setattr(watermark_orchestrator.os, "scandir", _no_scandir)
+
+    batch = [_record(tmp_path / "7.dat"), _record(tmp_path / "missing.dat"), _record(tmp_path / "subdir.dat")]
+    errors: list[str] = []
+    valid = await orchestrator._validate_batch(batch, errors)
+
+    assert [r.uid for r in valid] == ["7.dat"]
+    assert errors == [f"File not found: {tmp_path / 'missing.dat'}", f"Not a file: {tmp_path / 'subdir.dat'}"]
+    assert sorted(stat_calls) == sorted(r.file_location for r in batch)